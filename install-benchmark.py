@@ -0,0 +1,722 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2022 Detlev Offenbach <detlev@die-offenbachs.de>
+#
+# This is the benchmark script for the eric install script.
+
+"""
+Benchmark script for the installation script of eric.
+
+It generates a synthetic source tree shaped like the eric one together with
+lightweight stand-ins for the PyQt6 packages needed by the installer, runs
+install.py against a throwaway prefix and reports the time needed end to
+end and per phase as JSON.
+"""
+
+import getopt
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess  # secok
+import sys
+import tempfile
+import time
+
+# Define the globals.
+progName = None
+scale = 1.0
+repetitions = 3
+scenarios = ["cold", "reinstall", "incremental"]
+resultsFile = ""
+keepWorkDir = False
+installerArgs = []
+
+# Number of files of the synthetic source tree at scale 1.0, which is about
+# the size of an eric release.
+treeShape = {
+    "packages": 60,
+    "modules": 25,
+    "forms": 400,
+    "icons": 1800,
+    "translations": 40,
+    "apis": 3,
+}
+
+stubModules = {
+    "__init__.py": "",
+    "QtCore.py": """PYQT_VERSION = 0x60400
+PYQT_VERSION_STR = "6.4.0"
+
+
+def qVersion():
+    return "6.4.1"
+
+
+class QLibraryInfo:
+    class LibraryPath:
+        DataPath = 0
+        LibrariesPath = 1
+
+    @staticmethod
+    def path(libraryPath):
+        return {qtDir!r}
+""",
+    "Qsci.py": """QSCINTILLA_VERSION = 0x20D00
+QSCINTILLA_VERSION_STR = "2.13.0"
+""",
+    "sip.py": """SIP_VERSION = 0x60700
+SIP_VERSION_STR = "6.7.0"
+""",
+    "uic/__init__.py": '''import xml.etree.ElementTree as ElementTree
+
+
+def compileUi(uifile, pyfile, execute=False, indent=4, **kwargs):
+    """
+    Stand-in generating code for every widget and property of a form.
+    """
+    name = uifile if isinstance(uifile, str) else getattr(uifile, "name", "")
+    root = ElementTree.parse(uifile).getroot()
+    pyfile.write(
+        "# Form implementation generated from reading ui file {{0!r}}\\n"
+        "\\n"
+        "from PyQt6 import QtCore, QtGui, QtWidgets\\n"
+        "\\n"
+        "\\n"
+        "class Ui_Form(object):\\n"
+        "    def setupUi(self, Form):\\n".format(name)
+    )
+    for widget in root.iter("widget"):
+        objectName = widget.get("name")
+        pyfile.write(
+            "        self.{{0}} = QtWidgets.{{1}}(Form)\\n".format(
+                objectName, widget.get("class")
+            )
+        )
+        for prop in widget.findall("property"):
+            pyfile.write(
+                "        self.{{0}}.set{{1}}({{2!r}})\\n".format(
+                    objectName,
+                    prop.get("name").capitalize(),
+                    "".join(prop.itertext()).strip(),
+                )
+            )
+''',
+}
+# the add-on packages carry their own version attributes and distribution
+# metadata like the real ones
+stubDistributions = {
+    "QtCharts": ("PyQt6-Charts", "PYQT_CHART_VERSION", 0x60400, "6.4.0"),
+    "QtWebEngineCore": ("PyQt6-WebEngine", "PYQT_WEBENGINE_VERSION", 0x60400, "6.4.0"),
+}
+for module in [
+    "QtCharts",
+    "QtGui",
+    "QtNetwork",
+    "QtPrintSupport",
+    "QtSql",
+    "QtSvg",
+    "QtSvgWidgets",
+    "QtWebEngineCore",
+    "QtWebEngineWidgets",
+    "QtWidgets",
+]:
+    source = ""
+    if module in stubDistributions:
+        _distribution, attribute, version, versionStr = stubDistributions[module]
+        source = '{0} = {1:#x}\n{0}_STR = "{2}"\n'.format(
+            attribute, version, versionStr
+        )
+    if module == "QtWebEngineCore":
+        source += '\n\ndef qWebEngineVersion():\n    return "6.4.1"\n'
+    stubModules[module + ".py"] = source
+
+
+def usage(rcode=2):
+    """
+    Display a usage message and exit.
+
+    @param rcode the return code passed back to the calling process.
+    """
+    global progName
+
+    print()
+    print("Usage:")
+    print(
+        "    {0} [-hk] [-n num] [-o file] [-s scale] [--scenarios names]"
+        " [-- installer options]".format(progName)
+    )
+    print("where:")
+    print("    -h, --help display this help message")
+    print("    -k         keep the working directory")
+    print("    -n num     number of runs per scenario (default: 3)")
+    print("    -o file    write the results to the given JSON file")
+    print("    -s scale   size of the source tree relative to an eric release")
+    print("               (default: 1.0)")
+    print("    --scenarios names comma separated list of the scenarios to run")
+    print("               (default: cold,reinstall,incremental)")
+    print()
+    print("The scenarios are:")
+    print("    cold        install into an empty prefix with empty caches")
+    print("    reinstall   install over the previous installation")
+    print("    incremental install over the previous installation with the")
+    print("                '--incremental' option")
+    print()
+    print("Options following '--' are passed on to install.py.")
+
+    sys.exit(rcode)
+
+
+def writeFile(name, data):
+    """
+    Write a file creating its directory, if needed.
+
+    @param name name of the file
+    @type str
+    @param data contents of the file
+    @type str or bytes
+    @return size of the file
+    @rtype int
+    """
+    os.makedirs(os.path.dirname(name), exist_ok=True)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    with open(name, "wb") as f:
+        f.write(data)
+    return len(data)
+
+
+def moduleSource(rng, index):
+    """
+    Function to generate the source code of a module.
+
+    @param rng random number generator
+    @type random.Random
+    @param index number of the module
+    @type int
+    @return source code
+    @rtype str
+    """
+    lines = [
+        "# -*- coding: utf-8 -*-",
+        "",
+        '"""',
+        "Module implementing part {0} of the synthetic source tree.".format(index),
+        '"""',
+        "",
+        "import os",
+        "import re",
+        "",
+    ]
+    for classIndex in range(rng.randint(1, 4)):
+        lines += [
+            "",
+            "class Widget{0}(object):".format(classIndex),
+            '    """',
+            "    Class implementing a widget of the synthetic source tree.",
+            '    """',
+            "",
+        ]
+        for methodIndex in range(rng.randint(3, 12)):
+            lines += [
+                "    def method{0}(self, name, value=None):".format(methodIndex),
+                '        """',
+                "        Public method doing some work.",
+                "",
+                "        @param name name of the entry",
+                "        @type str",
+                "        @param value value of the entry",
+                "        @type int",
+                "        @return flag indicating success",
+                "        @rtype bool",
+                '        """',
+                "        if value is None:",
+                "            value = {0}".format(rng.randint(0, 1000)),
+                "        result = [",
+                "            os.path.join(name, str(i)) for i in range(value)",
+                '            if re.match(r"\\d+", str(i))',
+                "        ]",
+                "        return bool(result)",
+                "",
+            ]
+    return "\n".join(lines) + "\n"
+
+
+def formSource(rng, index):
+    """
+    Function to generate the contents of a form file.
+
+    @param rng random number generator
+    @type random.Random
+    @param index number of the form
+    @type int
+    @return contents of the form file
+    @rtype str
+    """
+    widgets = "".join(
+        """  <widget class="QLineEdit" name="edit{0}">
+   <property name="toolTip">
+    <string>Enter value {0}</string>
+   </property>
+   <property name="text">
+    <string>value {0}</string>
+   </property>
+  </widget>
+""".format(
+            widgetIndex
+        )
+        for widgetIndex in range(rng.randint(5, 40))
+    )
+    return """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form{0}</class>
+ <widget class="QDialog" name="Form{0}">
+{1} </widget>
+</ui>
+""".format(
+        index, widgets
+    )
+
+
+def createSourceTree(workDir, scale):
+    """
+    Function to generate a synthetic source tree shaped like the eric one.
+
+    @param workDir name of the working directory
+    @type str
+    @param scale size of the tree relative to an eric release
+    @type float
+    @return dictionary containing the number of the various kinds of files,
+        the total number of files and their size
+    @rtype dict
+    """
+    global treeShape
+
+    rng = random.Random(4711)
+    sourceDir = os.path.join(workDir, "eric")
+    ericDir = os.path.join(sourceDir, "eric7")
+    counts = {key: max(1, round(value * scale)) for key, value in treeShape.items()}
+    counts["modules"] = treeShape["modules"]
+    size = 0
+    files = 0
+
+    size += writeFile(
+        os.path.join(ericDir, "__init__.py"), '"""\nPackage eric7.\n"""\n'
+    )
+    size += writeFile(
+        os.path.join(ericDir, "UI", "Info.py"),
+        'Program = "eric7"\nVersion = "22.12 (benchmark)"\n',
+    )
+    files += 2
+    for name in [
+        "eric7",
+        "eric7_api",
+        "eric7_browser",
+        "eric7_compare",
+        "eric7_configure",
+        "eric7_diff",
+        "eric7_doc",
+        "eric7_editor",
+        "eric7_hexeditor",
+        "eric7_iconeditor",
+        "eric7_plugininstall",
+        "eric7_pluginrepository",
+        "eric7_pluginuninstall",
+        "eric7_qregularexpression",
+        "eric7_re",
+        "eric7_shell",
+        "eric7_snap",
+        "eric7_sqlbrowser",
+        "eric7_testing",
+        "eric7_tray",
+        "eric7_trpreviewer",
+        "eric7_uipreviewer",
+        "eric7_virtualenv",
+    ]:
+        size += writeFile(
+            os.path.join(ericDir, name + ".py"), "import sys\n\nsys.exit(0)\n"
+        )
+        files += 1
+
+    # Python modules in a package hierarchy including the debug clients and
+    # the plug-ins
+    packages = ["UI", "Plugins", "DebugClients/Python"] + [
+        "Package{0}/Sub{1}".format(index // 4, index % 4)
+        for index in range(counts["packages"] - 3)
+    ]
+    for package in packages:
+        packageDir = os.path.join(ericDir, *package.split("/"))
+        size += writeFile(os.path.join(packageDir, "__init__.py"), "")
+        files += 1
+        for index in range(counts["modules"]):
+            size += writeFile(
+                os.path.join(packageDir, "Module{0}.py".format(index)),
+                moduleSource(rng, index),
+            )
+            files += 1
+    for index in range(max(1, counts["packages"] // 10)):
+        size += writeFile(
+            os.path.join(ericDir, "Plugins", "Plugin{0}.py".format(index)),
+            moduleSource(rng, index),
+        )
+        files += 1
+
+    # forms
+    for index in range(counts["forms"]):
+        package = packages[index % len(packages)]
+        size += writeFile(
+            os.path.join(ericDir, *package.split("/"), "Form{0}.ui".format(index)),
+            formSource(rng, index),
+        )
+        files += 1
+
+    # icons and pixmaps
+    for index in range(counts["icons"]):
+        size += writeFile(
+            os.path.join(
+                ericDir,
+                "icons",
+                ("breeze-light", "breeze-dark")[index % 2],
+                "icon{0}.svg".format(index),
+            ),
+            '<svg xmlns="http://www.w3.org/2000/svg">{0}</svg>\n'.format(
+                "<path d='M0 0L{0} {0}'/>".format(index) * rng.randint(5, 60)
+            ),
+        )
+        files += 1
+    for name in ["eric_icon.png", "eric48_icon.png", "ericWeb48_icon.png"]:
+        size += writeFile(os.path.join(ericDir, "pixmaps", name), os.urandom(4096))
+        files += 1
+    size += writeFile(os.path.join(ericDir, "pixmaps", "eric_2.icns"), os.urandom(4096))
+    files += 1
+
+    # translations
+    for index in range(counts["translations"]):
+        size += writeFile(
+            os.path.join(ericDir, "i18n", "eric7_lang{0}.qm".format(index)),
+            os.urandom(rng.randint(100000, 400000)),
+        )
+        files += 1
+
+    # API files
+    for language in ["MicroPython", "Python3", "QSS"]:
+        for index in range(counts["apis"]):
+            apiName = os.path.join(
+                ericDir, "APIs", language, "{0}{1}.api".format(language, index)
+            )
+            size += writeFile(
+                apiName,
+                "".join(
+                    "module{0}.function{1}(arg, value=None)\n".format(index, line)
+                    for line in range(rng.randint(5000, 20000))
+                ),
+            )
+            size += writeFile(apiName[:-4] + ".bas", "Widget QObject\n")
+            files += 2
+
+    # data files of the various parts
+    for name, contents in [
+        ("CSSs/default.css", "body {}\n"),
+        ("Styles/default.qss", "QWidget {}\n"),
+        ("Themes/default.ethj", "{}\n"),
+        ("Documentation/index.html", "<html></html>\n"),
+        ("DesignerTemplates/dialog.tmpl", "<ui/>\n"),
+        ("CodeTemplates/module.tmpl", "# module\n"),
+        ("DebugClients/Python/coverage/htmlfiles/index.html", "<html></html>\n"),
+        ("data/data.txt", "data\n"),
+        ("EricNetwork/data/tld.dat", "com\n"),
+        ("IconEditor/cursors/cursor.xpm", "/* XPM */\n"),
+        ("UI/data/style.css", "body {}\n"),
+        ("WebBrowser/bookmarks.xbel", "<xbel/>\n"),
+        (
+            "data/linux/eric7.desktop.in",
+            "[Desktop Entry]\nExec=@BINDIR@/eric7@PY_MARKER@\nName=eric7@MARKER@\n",
+        ),
+        (
+            "data/linux/eric7_browser.desktop.in",
+            "[Desktop Entry]\nExec=@BINDIR@/eric7_browser@PY_MARKER@\n",
+        ),
+        (
+            "data/linux/eric7.appdata.xml.in",
+            "<component><release version='@VERSION@' date='@DATE@'/></component>\n",
+        ),
+    ]:
+        size += writeFile(os.path.join(ericDir, *name.split("/")), contents)
+        files += 1
+
+    for name in ["LICENSE.GPL3", "THANKS", "changelog", "README.rst"]:
+        size += writeFile(os.path.join(sourceDir, "docs", name), name * 1000)
+        files += 1
+    for name in ["default.ekj", "default_Mac.ekj", "default.e4k", "default_Mac.e4k"]:
+        size += writeFile(os.path.join(sourceDir, "others", name), "{}\n")
+        files += 1
+
+    counts["modules"] = counts["modules"] * len(packages)
+    counts["files"] = files
+    counts["bytes"] = size
+    return counts
+
+
+def createStubs(workDir):
+    """
+    Function to create the stand-ins for the PyQt6 packages.
+
+    @param workDir name of the working directory
+    @type str
+    @return name of the directory containing the stand-ins
+    @rtype str
+    """
+    global stubModules, stubDistributions
+
+    stubsDir = os.path.join(workDir, "stubs")
+    for name, source in stubModules.items():
+        writeFile(
+            os.path.join(stubsDir, "PyQt6", *name.split("/")),
+            source.format(qtDir=os.path.join(workDir, "qt")),
+        )
+    for distribution, _attribute, _version, versionStr in stubDistributions.values():
+        writeFile(
+            os.path.join(
+                stubsDir,
+                "{0}-{1}.dist-info".format(distribution.replace("-", "_"), versionStr),
+                "METADATA",
+            ),
+            "Metadata-Version: 2.1\nName: {0}\nVersion: {1}\n".format(
+                distribution, versionStr
+            ),
+        )
+    return stubsDir
+
+
+def findInstallInfo(prefix):
+    """
+    Function to find the install info file of an installation.
+
+    @param prefix installation prefix
+    @type str
+    @return name of the install info file (empty, if not found)
+    @rtype str
+    """
+    for root, _dirs, files in os.walk(prefix):
+        if "eric7install.json" in files:
+            return os.path.join(root, "eric7install.json")
+    return ""
+
+
+def runInstaller(workDir, prefix, scenario, stubsDir):
+    """
+    Function to run the installer for a scenario.
+
+    @param workDir name of the working directory
+    @type str
+    @param prefix installation prefix
+    @type str
+    @param scenario name of the scenario
+    @type str
+    @param stubsDir name of the directory containing the PyQt6 stand-ins
+    @type str
+    @return dictionary containing the result of the run
+    @rtype dict
+    """
+    global installerArgs
+
+    cacheDir = os.path.join(workDir, "cache")
+    if scenario == "cold":
+        shutil.rmtree(prefix, ignore_errors=True)
+        shutil.rmtree(cacheDir, ignore_errors=True)
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [stubsDir] + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else [])
+    )
+    env["HOME"] = os.path.join(workDir, "home")
+    env["XDG_CACHE_HOME"] = cacheDir
+    args = [
+        sys.executable,
+        os.path.join(workDir, "install.py"),
+        "-x",
+        "-i",
+        prefix,
+        "-b",
+        "/usr/bin",
+        "--yes",
+    ]
+    if scenario == "incremental":
+        args.append("--incremental")
+    args += installerArgs
+
+    start = time.monotonic()
+    proc = subprocess.run(  # secok
+        args, cwd=workDir, env=env, capture_output=True, text=True
+    )
+    wall = time.monotonic() - start
+
+    result = {
+        "scenario": scenario,
+        "returncode": proc.returncode,
+        "wall": round(wall, 3),
+        "phases": [],
+    }
+    if proc.returncode != 0:
+        result["output"] = (proc.stdout + proc.stderr)[-4000:]
+    else:
+        infoName = findInstallInfo(prefix)
+        if infoName:
+            with open(infoName, "r", encoding="utf-8") as f:
+                result["phases"] = json.load(f).get("phases", [])
+    return result
+
+
+def summarize(runs):
+    """
+    Function to summarize the runs per scenario.
+
+    @param runs list of results of the runs
+    @type list of dict
+    @return dictionary containing the minimum and median wall times of each
+        scenario and the median wall times of its phases
+    @rtype dict
+    """
+    summary = {}
+    for scenario in dict.fromkeys(run["scenario"] for run in runs):
+        walls = [run["wall"] for run in runs if run["scenario"] == scenario]
+        phaseWalls = {}
+        for run in runs:
+            if run["scenario"] == scenario:
+                for phase in run["phases"]:
+                    phaseWalls.setdefault(phase["name"], []).append(phase["wall"])
+        summary[scenario] = {
+            "wall_min": min(walls),
+            "wall_median": round(statistics.median(walls), 3),
+            "phases": {
+                name: round(statistics.median(values), 3)
+                for name, values in phaseWalls.items()
+            },
+        }
+    return summary
+
+
+def main(argv):
+    """
+    The main function of the script.
+
+    @param argv list of command line arguments
+    @type list of str
+    """
+    global progName, scale, repetitions, scenarios, resultsFile, keepWorkDir
+    global installerArgs
+
+    progName = os.path.basename(argv[0])
+
+    try:
+        optlist, args = getopt.getopt(argv[1:], "hkn:o:s:", ["help", "scenarios="])
+    except getopt.GetoptError as err:
+        print(err)
+        usage()
+
+    for opt, arg in optlist:
+        if opt in ["-h", "--help"]:
+            usage(0)
+        elif opt == "-k":
+            keepWorkDir = True
+        elif opt == "-n":
+            try:
+                repetitions = int(arg)
+            except ValueError:
+                print("The number of runs must be an integer.")
+                usage()
+        elif opt == "-o":
+            resultsFile = os.path.abspath(arg)
+        elif opt == "-s":
+            try:
+                scale = float(arg)
+            except ValueError:
+                print("The scale must be a number.")
+                usage()
+        elif opt == "--scenarios":
+            scenarios = [name.strip() for name in arg.split(",") if name.strip()]
+            for name in scenarios:
+                if name not in ("cold", "reinstall", "incremental"):
+                    print("Unknown scenario '{0}'.".format(name))
+                    usage()
+    installerArgs = args
+
+    workDir = tempfile.mkdtemp(prefix="eric7-benchmark-")
+    try:
+        print("Creating the source tree in '{0}' ...".format(workDir))
+        tree = createSourceTree(workDir, scale)
+        stubsDir = createStubs(workDir)
+        shutil.copy(
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), "install.py"),
+            workDir,
+        )
+        prefix = os.path.join(workDir, "prefix")
+
+        runs = []
+        for repetition in range(repetitions):
+            for scenario in scenarios:
+                print(
+                    "Running scenario '{0}' ({1}/{2}) ...".format(
+                        scenario, repetition + 1, repetitions
+                    )
+                )
+                result = runInstaller(workDir, prefix, scenario, stubsDir)
+                result["repetition"] = repetition + 1
+                runs.append(result)
+                if result["returncode"] != 0:
+                    print(result["output"])
+                    print(
+                        "The installer failed with exit code {0}.".format(
+                            result["returncode"]
+                        )
+                    )
+                    sys.exit(1)
+
+        results = {
+            "python": sys.version,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "scale": scale,
+            "tree": tree,
+            "installer_args": installerArgs,
+            "runs": runs,
+            "summary": summarize(runs),
+        }
+    finally:
+        if keepWorkDir:
+            print("The working directory '{0}' was kept.".format(workDir))
+        else:
+            shutil.rmtree(workDir, ignore_errors=True)
+
+    print()
+    print(
+        "{0} files, {1:.1f} MiB (scale {2})".format(
+            tree["files"], tree["bytes"] / 1048576, scale
+        )
+    )
+    for scenario, summary in results["summary"].items():
+        print(
+            "{0:<12} min {1:7.3f}s  median {2:7.3f}s".format(
+                scenario, summary["wall_min"], summary["wall_median"]
+            )
+        )
+        for name, wall in summary["phases"].items():
+            print("    {0:<22} {1:7.3f}s".format(name, wall))
+
+    if resultsFile:
+        with open(resultsFile, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print("\nThe results were written to '{0}'.".format(resultsFile))
+    else:
+        print()
+        print(json.dumps(results["summary"], indent=2))
+
+
+if __name__ == "__main__":
+    main(sys.argv)
+
+#
+# eflag: noqa = M801
@@ -9,22 +9,31 @@
 Installation script for the eric IDE and all eric related tools.
 """
 
-import compileall
+import concurrent.futures
 import contextlib
 import datetime
 import fnmatch
 import getpass
 import glob
+import hashlib
+import importlib.util
 import io
 import json
+import marshal
+import multiprocessing
 import os
 import py_compile
 import re
 import shlex
 import shutil
+import stat
 import subprocess  # secok
+import tarfile
+import tempfile
+import threading
 import time
 import sys
+import zipfile
 
 # Define the globals.
 progName = None
@@ -43,10 +52,60 @@ doCompile = True
 yes2All = False
 withPyqt6Tools = False
 verbose = False
+installJobs = 0
+knownDirs = set()
+installStateLock = threading.RLock()
+compileTimes = {}
+pycInvalidation = ""
+compactInstall = False
+pathStartedModules = None
+zipBundle = False
+zipBundleName = "eric7.zip"
+moduleIndex = False
+moduleIndexName = "eric7modules.json"
+optimizationLevels = [0]
+installPhases = []
+phaseState = threading.local()
+phaseCountersLock = threading.Lock()
+activePhases = {}
+phaseRssPeaks = {}
+phaseOutputLock = threading.Lock()
+traceFileName = ""
+traceStart = time.monotonic()
+traceEvents = []
+copyTimes = {}
+installPhaseNames = [
+    "release archive",
+    "dependency checks",
+    "revision",
+    "source cleanup",
+    "cleanup",
+    "configuration",
+    "forms",
+    "assets",
+    "compilation",
+    "installation",
+    "platform specifics",
+    "finishing",
+]
+profileCpu = False
+profileMemory = False
+profilePhases = []
+profiledScope = None
+cpuProfiler = None
+memoryReports = []
+probeDependencies = False
+probeTimes = []
 cfg = {}
 progLanguages = ["MicroPython", "Python3", "QSS"]
 sourceDir = "eric"
+installFromSource = False
+sourceRevision = ""
+infoName = ""
 eric7SourceDir = ""
+sourceArchiveName = ""
+sourceArchive = {}
+sourceArchiveDirs = {}
 configName = "eric7config.py"
 defaultMacAppBundleName = "eric7.app"
 defaultMacAppBundlePath = "/Applications"
@@ -63,6 +122,26 @@ createInstallInfoFile = True
 installInfoName = "eric7install.json"
 installInfo = {}
 installCwd = ""
+installManifestName = "eric7install.manifest.json"
+installManifest = {}
+installDirectories = set()
+previousManifest = {}
+obsoleteManifest = {}
+obsoleteDirectories = []
+assetsInstalled = False
+tombstoneThreads = []
+stagedInstall = False
+stagingDir = ""
+stagedEricDir = ""
+stagedFiles = {}
+copyStrategy = "copy"
+installArchive = None
+installArchiveFiles = []
+cloneMethods = {"hardlink": True, "reflink": True, "copy_file_range": True}
+incrementalInstall = False
+pipWheelhouse = ""
+pipLockFile = ""
+writeLockFileName = ""
 
 # Define blacklisted versions of the prerequisites
 BlackLists = {
@@ -97,7 +176,10 @@ def exit(rcode=0):
     """
     global currDir
 
+    writeProfileReports()
+
     print()
+    flushPhaseOutput()
 
     if sys.platform.startswith(("win", "cygwin")):
         with contextlib.suppress(EOFError):
@@ -122,21 +204,42 @@ def usage(rcode=2):
     if sys.platform == "darwin":
         print(
             "    {0} [-chvxz] [-a dir] [-b dir] [-d dir] [-f file] [-i dir]"
-            " [-m name] [-n path] [-p python] [--help] [--no-apis]"
-            " [--no-info] [--no-tools] [--verbose] [--yes]".format(progName)
+            " [-j num] [-m name] [-n path] [-p python] [--archive file]"
+            " [--compact] [--copy-strategy name] [--from-archive file] [--help]"
+            " [--incremental] [--lock file] [--module-index] [--no-apis]"
+            " [--no-info] [--no-tools] [--optimize levels] [--probe-deps]"
+            " [--profile] [--profile-memory]"
+            " [--profile-phases names] [--pyc-invalidation mode] [--staged]"
+            " [--trace file] [--uninstall] [--verbose] [--wheelhouse dir]"
+            " [--write-lock file] [--yes] [--zip-bundle]".format(progName)
         )
     elif sys.platform.startswith(("win", "cygwin")):
         print(
-            "    {0} [-chvxz] [-a dir] [-b dir] [-d dir] [-f file]"
-            " [--clean-desktop] [--help] [--no-apis] [--no-info]"
-            " [--no-tools] [--verbose] [--yes]".format(progName)
+            "    {0} [-chvxz] [-a dir] [-b dir] [-d dir] [-f file] [-j num]"
+            " [--archive file] [--clean-desktop] [--compact]"
+            " [--copy-strategy name] [--from-archive file] [--help]"
+            " [--incremental] [--lock file] [--module-index] [--no-apis]"
+            " [--no-info] [--no-tools] [--optimize levels]"
+            " [--probe-deps] [--profile] [--profile-memory]"
+            " [--profile-phases names] [--pyc-invalidation mode] [--staged]"
+            " [--trace file] [--uninstall] [--verbose] [--wheelhouse dir]"
+            " [--write-lock file] [--yes] [--zip-bundle]".format(progName)
         )
     else:
         print(
             "    {0} [-chvxz] [-a dir] [-b dir] [-d dir] [-f file] [-i dir]"
-            " [--help] [--no-apis] [--no-info] [--no-tools] [--verbose]"
-            " [--yes]".format(progName)
+            " [-j num] [--archive file] [--compact] [--copy-strategy name]"
+            " [--from-archive file] [--help] [--incremental] [--lock file]"
+            " [--module-index] [--no-apis] [--no-info] [--no-tools]"
+            " [--optimize levels]"
+            " [--probe-deps] [--profile] [--profile-memory]"
+            " [--profile-phases names] [--pyc-invalidation mode] [--staged]"
+            " [--trace file] [--uninstall] [--verbose] [--wheelhouse dir]"
+            " [--write-lock file] [--yes] [--zip-bundle]".format(progName)
         )
+    if apisDir is None:
+        apisDir = defaultApisDir()
+
     print("where:")
     print("    -h, --help display this help message")
     print("    -a dir     where the API files will be installed")
@@ -153,6 +256,9 @@ def usage(rcode=2):
     if not sys.platform.startswith(("win", "cygwin")):
         print("    -i dir     temporary install prefix")
         print("               (default: {0})".format(distDir))
+    print("    -j num     number of parallel workers")
+    print("               (default: number of CPUs, 1 also runs the phases of")
+    print("               the installation one after the other)")
     if sys.platform == "darwin":
         print("    -m name    name of the Mac app bundle")
         print("               (default: {0})".format(macAppBundleName))
@@ -167,10 +273,56 @@ def usage(rcode=2):
     print("    -z         don't compile the installed python files")
     print("    --yes      answer 'yes' to all questions")
     print()
+    print("    --archive file write the installation to a .tar.gz, .tar.zst")
+    print("               or .zip archive instead of the file system")
+    print("    --compact  install the modules as byte code files without")
+    print("               docstrings (-OO) only, the scripts, debug clients")
+    print("               and plug-in modules keep their sources")
     if sys.platform.startswith(("win", "cygwin")):
         print("    --clean-desktop delete desktop links before installation")
+    print("    --copy-strategy auto|reflink|hardlink|copy")
+    print("               how the files are installed: 'reflink' clones them")
+    print("               on file systems supporting it, 'auto' uses")
+    print("               copy_file_range() as the next choice, 'hardlink'")
+    print("               links them (for sources not changed afterwards)")
+    print("               and 'copy' copies them (default: copy)")
+    print("    --from-archive file install from a release archive (.zip or")
+    print("               .tar.*) without extracting it first")
+    print("    --incremental only copy the files changed since the previous")
+    print("               installation and remove the obsolete ones")
+    print("    --lock file install the dependencies with the versions given")
+    print("               in the lock file")
+    print("    --module-index write an index of the installed modules used")
+    print("               by eric7config to import them without searching")
+    print("               the module search path")
     print("    --no-info  don't create the install info file")
+    print("    --optimize levels comma separated optimization levels (0, 1")
+    print("               and/or 2) to write byte code files for (default: 0)")
+    print("    --probe-deps check the dependencies without importing them")
+    print("               into the installer process")
+    print("    --profile  write a CPU profile of the installer")
+    print("    --profile-memory write a report of the top memory allocations")
+    print("    --profile-phases names restrict profiling to the given comma")
+    print("               separated phases (e.g. 'forms,installation')")
+    print("    --pyc-invalidation timestamp|checked-hash|unchecked-hash")
+    print("               how byte code files are validated against their")
+    print("               sources; 'unchecked-hash' saves checking the sources")
+    print("               at startup, but is meant for read-only installations")
+    print("               only (default: timestamp, checked-hash with")
+    print("               SOURCE_DATE_EPOCH set)")
+    print("    --staged   build the eric directory next to the installed one")
+    print("               and swap it into place after it is complete")
+    print("    --trace file write a timeline of the installation in the trace")
+    print("               event format (e.g. for chrome://tracing)")
+    print("    --uninstall remove the files of an installation recorded in")
+    print("               its manifest")
+    print("    --wheelhouse dir install the dependencies from the given")
+    print("               directory without accessing the package index")
     print("    --with-tools don't install qt6-applications")
+    print("    --write-lock file write the versions of the installed")
+    print("               dependencies to the lock file")
+    print("    --zip-bundle install the eric modules as a zip archive, that is")
+    print("               put on the module search path by the wrappers")
     print()
     print("The file given to the -f option must be valid Python code" " defining a")
     print(
@@ -220,6 +372,20 @@ def initGlobals():
     modDir = sysconfig.get_path("platlib")
     pyModDir = modDir
 
+    # the API directory is determined after the command line was parsed in
+    # order to not import Qt for an uninstallation
+    apisDir = None
+
+
+def defaultApisDir():
+    """
+    Function to determine the default directory of the API files.
+
+    @return name of the API directory or None, if it could not be determined
+    @rtype str
+    """
+    global modDir
+
     pyqtDataDir = os.path.join(modDir, "PyQt6")
     if os.path.exists(os.path.join(pyqtDataDir, "qsci")):
         # it's the installer
@@ -235,7 +401,732 @@ def initGlobals():
             qtDataDir = QLibraryInfo.path(QLibraryInfo.LibraryPath.DataPath)
         except ImportError:
             qtDataDir = None
-    apisDir = os.path.join(qtDataDir, "qsci", "api") if qtDataDir else None
+    return os.path.join(qtDataDir, "qsci", "api") if qtDataDir else None
+
+
+def startProfiling(scope):
+    """
+    Function to start profiling the installer as requested.
+
+    @param scope name of the profiled phase (empty for the whole run)
+    @type str
+    @return flag indicating, that profiling was started
+    @rtype bool
+    """
+    global profileCpu, profileMemory, profiledScope, cpuProfiler
+
+    if profiledScope is not None or not (profileCpu or profileMemory):
+        return False
+
+    if profileCpu:
+        if cpuProfiler is None:
+            import cProfile
+
+            cpuProfiler = cProfile.Profile()
+        cpuProfiler.enable()
+    if profileMemory:
+        import tracemalloc
+
+        tracemalloc.start()
+    profiledScope = scope
+    return True
+
+
+def stopProfiling():
+    """
+    Stop profiling the installer.
+
+    The CPU profile of all profiled phases is accumulated. A report of the
+    top allocations is taken for each of them.
+    """
+    global profileMemory, profiledScope, cpuProfiler, memoryReports
+
+    if profiledScope is None:
+        return
+
+    if cpuProfiler is not None:
+        cpuProfiler.disable()
+    if profileMemory:
+        import tracemalloc
+
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+                tracemalloc.Filter(False, "<unknown>"),
+            )
+        )
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        memoryReports.append(
+            (profiledScope or "whole run", peak, snapshot.statistics("lineno")[:25])
+        )
+    profiledScope = None
+
+
+def writeProfileReports():
+    """
+    Write the profiling reports to the directory the installer was started
+    from.
+
+    The CPU profile is written as 'eric7install.pstats' for further analysis
+    with the pstats module and as a text report sorted by cumulative time.
+    The top allocations are written to 'eric7install.memory.txt'.
+    """
+    global installCwd, cpuProfiler, memoryReports
+
+    stopProfiling()
+    if cpuProfiler is None and not memoryReports:
+        return
+
+    try:
+        if cpuProfiler is not None:
+            import pstats
+
+            statsName = os.path.join(installCwd, "eric7install.pstats")
+            cpuProfiler.dump_stats(statsName)
+            with open(statsName + ".txt", "w", encoding="utf-8") as f:
+                pstats.Stats(cpuProfiler, stream=f).sort_stats(
+                    "cumulative"
+                ).print_stats(50)
+            print("The CPU profile was written to '{0}'.".format(statsName))
+            cpuProfiler = None
+
+        if memoryReports:
+            reportName = os.path.join(installCwd, "eric7install.memory.txt")
+            with open(reportName, "w", encoding="utf-8") as f:
+                for scope, peak, statistics in memoryReports:
+                    f.write(
+                        "{0}: peak of traced memory {1:.1f} KiB\n".format(
+                            scope, peak / 1024
+                        )
+                    )
+                    for statistic in statistics:
+                        f.write("    {0}\n".format(statistic))
+                    f.write("\n")
+            print("The memory profile was written to '{0}'.".format(reportName))
+            memoryReports = []
+    except OSError as err:
+        print("The profiling reports could not be written: {0}".format(err))
+
+
+def runProcess(args, **kwargs):
+    """
+    Function to run a subprocess and count it for the phase metrics.
+
+    @param args command line of the subprocess
+    @type list of str
+    @param kwargs keyword arguments passed on to subprocess.run()
+    @type dict
+    @return completed process
+    @rtype subprocess.CompletedProcess
+    """
+    countPhaseMetric("subprocesses", 1)
+    if "-m" in args:
+        name = " ".join(args[args.index("-m") + 1 : args.index("-m") + 3])
+    else:
+        name = os.path.basename(args[0])
+    start = time.monotonic()
+    try:
+        return subprocess.run(args, **kwargs)  # secok
+    finally:
+        traceSpan(name, "subprocess", start, time.monotonic(), args={"argv": args})
+
+
+def countPhaseMetric(key, value):
+    """
+    Count a metric for the phases running in the current thread.
+
+    @param key name of the metric
+    @type str
+    @param value value to be added
+    @type int
+    """
+    global phaseState, phaseCountersLock
+
+    with phaseCountersLock:
+        for counters in getattr(phaseState, "counters", []):
+            counters[key] += value
+
+
+def countWrittenFile(size):
+    """
+    Count a file written by the installer for the phase metrics.
+
+    @param size number of bytes written
+    @type int
+    """
+    countPhaseMetric("files", 1)
+    countPhaseMetric("bytes", size)
+
+
+def phaseTask(function):
+    """
+    Function to wrap a function to be run by a worker thread, so that its
+    metrics are counted for the phases of the calling thread.
+
+    @param function function to be wrapped
+    @type function
+    @return wrapped function
+    @rtype function
+    """
+    global phaseState
+
+    counters = list(getattr(phaseState, "counters", []))
+
+    def task(*args, **kwargs):
+        phaseState.counters = counters
+        try:
+            return function(*args, **kwargs)
+        finally:
+            del phaseState.counters
+
+    return task
+
+
+def maxRss():
+    """
+    Function to get the maximum resident set size of the installer and its
+    finished child processes reached so far.
+
+    This is the high-water mark of the whole process lifetime. Resetting the
+    peak of the installer process via the proc file system of Linux (see
+    updatePhaseRss()) resets this value as well, so it is only meaningful
+    where the per-phase peak cannot be determined.
+
+    @return maximum resident set size in KiB or None, if it cannot be
+        determined
+    @rtype int
+    """
+    try:
+        import resource
+    except ImportError:
+        # not available on Windows
+        return None
+
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # macOS reports bytes instead of KiB
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def updatePhaseRss():
+    """
+    Function to add the peak resident set size of the installer process
+    since the last call to the running phases and to reset it.
+
+    The peak is read from and reset via the proc file system of Linux, so
+    that every phase gets the peak reached while it was running. Note, that
+    the reset lowers the maximum resident set size reported by getrusage()
+    for the installer process as well (see maxRss()).
+
+    @return flag indicating, that the peak could be determined
+    @rtype bool
+    """
+    global phaseRssPeaks
+
+    try:
+        with open("/proc/self/status", "r") as f:
+            peak = next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except (OSError, ValueError, IndexError, StopIteration):
+        return False
+
+    for key in phaseRssPeaks:
+        phaseRssPeaks[key] = max(phaseRssPeaks[key], peak)
+    return True
+
+
+@contextlib.contextmanager
+def installPhase(name):
+    """
+    Context manager to measure a phase of the installation.
+
+    The wall time, the CPU time (including the one of finished child
+    processes), the peak resident set size of the installer process while
+    the phase was running, the number of files and bytes written and the
+    number of subprocesses started are recorded in the list of phases. Where
+    the per-phase peak cannot be determined (i.e. outside of Linux), the
+    maximum resident set size of the installer and its finished child
+    processes reached so far is recorded instead. Phases may be nested. Phases running
+    concurrently in different threads are nested independently and count
+    the files, bytes and subprocesses of their own thread only. The CPU time
+    is measured for the whole process, so it is marked as overlapping for
+    phases, that ran concurrently with another one.
+
+    @param name name of the phase
+    @type str
+    @yield None
+    """
+    global installPhases, phaseState, phaseCountersLock, activePhases
+    global phaseRssPeaks, profilePhases
+
+    profiling = name in profilePhases and startProfiling(name)
+    depth = getattr(phaseState, "depth", 0)
+    phase = {"name": name, "depth": depth, "overlapping": False}
+    installPhases.append(phase)
+    phaseState.depth = depth + 1
+    counters = {"files": 0, "bytes": 0, "subprocesses": 0}
+    thread = threading.get_ident()
+    with phaseCountersLock:
+        phaseState.counters = getattr(phaseState, "counters", []) + [counters]
+        for other, otherThread in activePhases.values():
+            if otherThread != thread:
+                other["overlapping"] = phase["overlapping"] = True
+        activePhases[id(phase)] = (phase, thread)
+        updatePhaseRss()
+        phaseRssPeaks[id(phase)] = 0
+    times = os.times()
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        end = time.monotonic()
+        endTimes = os.times()
+        phase["wall"] = round(end - start, 3)
+        phase["cpu"] = round(sum(endTimes[:4]) - sum(times[:4]), 3)
+        with phaseCountersLock:
+            del activePhases[id(phase)]
+            rssMeasured = updatePhaseRss()
+            peak = phaseRssPeaks.pop(id(phase))
+            # resetting the peak falsifies the process lifetime maximum
+            phase["peak_rss_kb"] = peak if rssMeasured else None
+            phase["max_rss_kb"] = None if rssMeasured else maxRss()
+            phaseState.counters = phaseState.counters[:-1]
+            phase.update(counters)
+        phaseState.depth = depth
+        traceSpan(
+            name,
+            "phase",
+            start,
+            end,
+            args={key: phase[key] for key in counters},
+        )
+        if profiling:
+            stopProfiling()
+
+
+class PhaseOutput:
+    """
+    Class implementing an output stream buffering the output of the phases
+    run concurrently.
+
+    The output written by a thread running a buffered phase is kept until the
+    phase has finished (see flushPhaseOutput()), so that the output of
+    concurrent phases does not interleave. The output of all other threads is
+    passed on to the wrapped stream.
+    """
+
+    def __init__(self, stream):
+        """
+        Constructor
+
+        @param stream output stream to be wrapped
+        @type io.TextIOBase
+        """
+        self.stream = stream
+
+    def write(self, text):
+        """
+        Public method to write some text.
+
+        @param text text to be written
+        @type str
+        @return number of characters written
+        @rtype int
+        """
+        output = getattr(phaseState, "output", None)
+        if output is None:
+            return self.stream.write(text)
+
+        output.append((self.stream, text))
+        return len(text)
+
+    def isatty(self):
+        """
+        Public method to check, if the output goes to a terminal.
+
+        @return flag indicating a terminal
+        @rtype bool
+        """
+        return getattr(phaseState, "output", None) is None and self.stream.isatty()
+
+    def __getattr__(self, name):
+        """
+        Special method to pass on the access to other attributes to the wrapped
+        stream.
+
+        @param name name of the attribute
+        @type str
+        @return value of the attribute
+        @rtype Any
+        """
+        return getattr(self.stream, name)
+
+
+def flushPhaseOutput():
+    """
+    Function to write the buffered output of the phase running in the current
+    thread and to stop buffering it.
+    """
+    global phaseState, phaseOutputLock
+
+    output = getattr(phaseState, "output", None)
+    phaseState.output = None
+    if output:
+        with phaseOutputLock:
+            for stream, text in output:
+                stream.write(text)
+            for stream in {stream for stream, _ in output}:
+                stream.flush()
+
+
+def runPhase(name, function, buffered=False):
+    """
+    Run a phase of the installation.
+
+    @param name name of the phase
+    @type str
+    @param function function performing the phase
+    @type function
+    @param buffered flag indicating to buffer the output of the phase until
+        it has finished (defaults to False)
+    @type bool (optional)
+    """
+    global phaseState
+
+    phaseState.output = [] if buffered else None
+    try:
+        with installPhase(name):
+            function()
+    finally:
+        flushPhaseOutput()
+
+
+def runPhases(phases):
+    """
+    Run phases of the installation as soon as their inputs are available.
+
+    Each phase declares the inputs it needs and the outputs it produces. A
+    phase is ready, when all phases producing its inputs have finished.
+    Inputs not produced by any of the given phases are available upfront.
+    Ready phases are run concurrently by a pool of threads, because they
+    share the global state of the installer. The install manifest and the
+    created directories are guarded by the lock of the installation state,
+    the metrics by the one of the phase counters. When profiling or when a
+    single job was requested, the phases are run one after the other in the
+    given order, which must respect their dependencies. The output of phases
+    run concurrently is buffered and written as a whole, once a phase has
+    finished.
+
+    If a phase fails, no further phases are started and the exception of the
+    first failed phase (e.g. the SystemExit raised by exit()) is raised again
+    once the running phases have finished.
+
+    @param phases list of tuples containing the name of the phase, the
+        function performing it, the list of its inputs and the list of its
+        outputs
+    @type list of tuple of (str, function, list of str, list of str)
+    @exception BaseException raised to pass on the failure of a phase
+    """
+    global installJobs, profileCpu, profileMemory
+
+    if installJobs == 1 or profileCpu or profileMemory:
+        for name, function, _, _ in phases:
+            runPhase(name, function)
+        return
+
+    producers = {}
+    for name, _, _, outputs in phases:
+        for output in outputs:
+            producers.setdefault(output, set()).add(name)
+    functions = {name: function for name, function, _, _ in phases}
+    pending = {
+        name: {producer for i in inputs for producer in producers.get(i, [])}
+        for name, _, inputs, _ in phases
+    }
+
+    running = {}
+    failure = None
+    streams = sys.stdout, sys.stderr
+    sys.stdout, sys.stderr = PhaseOutput(sys.stdout), PhaseOutput(sys.stderr)
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(phases)) as executor:
+            while pending or running:
+                if failure is None:
+                    for name in [n for n, req in pending.items() if not req]:
+                        del pending[name]
+                        future = executor.submit(runPhase, name, functions[name], True)
+                        running[future] = name
+                if not running:
+                    break
+                done, _ = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    name = running.pop(future)
+                    if future.exception() is not None:
+                        if failure is None:
+                            failure = future.exception()
+                    else:
+                        for required in pending.values():
+                            required.discard(name)
+    finally:
+        sys.stdout, sys.stderr = streams
+
+    if failure is not None:
+        raise failure
+
+
+def formatPhaseRss(phase):
+    """
+    Function to format the resident set size of a phase for the summary.
+
+    @param phase phase record
+    @type dict
+    @return formatted resident set size
+    @rtype str
+    """
+    if phase["peak_rss_kb"] is not None:
+        return "{0:.1f} MiB ".format(phase["peak_rss_kb"] / 1024)
+    elif phase["max_rss_kb"] is not None:
+        return "{0:.1f} MiB^".format(phase["max_rss_kb"] / 1024)
+    else:
+        return "- "
+
+
+def printPhaseSummary():
+    """
+    Print a table of the measured phases of the installation.
+    """
+    global installPhases
+
+    print(
+        "\n{0:<22} {1:>8} {2:>9} {3:>10} {4:>7} {5:>10} {6:>5}".format(
+            "Phase", "Wall", "CPU", "Peak RSS", "Files", "Written", "Procs"
+        )
+    )
+    for phase in installPhases:
+        if "wall" not in phase:
+            continue
+        print(
+            "{0:<22} {1:>7.2f}s {2:>9} {3:>10} {4:>7} {5:>10} {6:>5}".format(
+                "  " * phase["depth"] + phase["name"],
+                phase["wall"],
+                "{0:.2f}s{1}".format(
+                    phase["cpu"], "*" if phase["overlapping"] else " "
+                ),
+                formatPhaseRss(phase),
+                phase["files"],
+                "{0:.1f} MiB".format(phase["bytes"] / 1048576),
+                phase["subprocesses"],
+            )
+        )
+    if any(phase.get("overlapping") for phase in installPhases):
+        print("* CPU time of phases running concurrently with other ones")
+    if any(phase.get("max_rss_kb") is not None for phase in installPhases):
+        print("^ maximum resident set size reached so far (no per-phase peak)")
+
+
+def traceTimestamp(timestamp):
+    """
+    Function to convert a time stamp into the time base of the trace.
+
+    @param timestamp time stamp as returned by time.monotonic()
+    @type float
+    @return microseconds since the start of the installer
+    @rtype int
+    """
+    global traceStart
+
+    return round((timestamp - traceStart) * 1000000)
+
+
+def traceSpan(name, category, start, end, pid=None, tid=None, args=None):
+    """
+    Record a span of the trace, if a trace was requested.
+
+    @param name name of the span
+    @type str
+    @param category category of the span
+    @type str
+    @param start start time as returned by time.monotonic()
+    @type float
+    @param end end time as returned by time.monotonic()
+    @type float
+    @param pid ID of the process (defaults to the installer process)
+    @type int
+    @param tid ID of the thread (defaults to the current thread)
+    @type int
+    @param args additional information to be shown for the span
+    @type dict
+    """
+    global traceFileName, traceEvents
+
+    if traceFileName:
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": traceTimestamp(start),
+            "dur": traceTimestamp(end) - traceTimestamp(start),
+            "pid": os.getpid() if pid is None else pid,
+            "tid": threading.get_ident() if tid is None else tid,
+        }
+        if args:
+            event["args"] = args
+        traceEvents.append(event)
+
+
+def traceCopySubtrees(filterSets):
+    """
+    Record the spans of copying the subtrees given by a list of filter sets.
+
+    Subtrees are copied concurrently, so they are recorded as asynchronous
+    spans reaching from the first to the last file copied.
+
+    @param filterSets list of tuples containing the source directory, the
+        destination directory, a list of filter patterns determining the
+        files to be copied and a list of filter patterns determining the
+        files and directories to be skipped
+    @type list of tuple of (str, str, list of str, list of str)
+    """
+    global traceFileName, traceEvents, copyTimes, eric7SourceDir
+
+    if not traceFileName:
+        return
+
+    # assign the files to the innermost subtree containing them
+    roots = sorted(
+        ((os.path.normpath(dst), src) for src, dst, _, _ in filterSets),
+        key=lambda root: len(root[0]),
+        reverse=True,
+    )
+    subtrees = {}
+    for dst, (begin, end, _tid, _threadName) in copyTimes.items():
+        for root, src in roots:
+            if dst.startswith(root + os.sep):
+                first, last = subtrees.get(src, (begin, end))
+                subtrees[src] = (min(first, begin), max(last, end))
+                break
+
+    for index, (src, (begin, end)) in enumerate(sorted(subtrees.items())):
+        for phase, timestamp in (("b", begin), ("e", end)):
+            traceEvents.append(
+                {
+                    "name": os.path.relpath(src, os.path.dirname(eric7SourceDir)),
+                    "cat": "copyTree",
+                    "ph": phase,
+                    "id": index,
+                    "ts": traceTimestamp(timestamp),
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                }
+            )
+
+
+def writeTrace(fileName):
+    """
+    Write the trace of the installation in the trace event format.
+
+    Besides the recorded spans, the trace contains a span for every module
+    compiled and every file copied by a worker.
+
+    @param fileName name of the trace file
+    @type str
+    """
+    global traceEvents, compileTimes, copyTimes
+
+    threadNames = {threading.get_ident(): "main"}
+    for dst, (begin, end, tid, threadName) in copyTimes.items():
+        traceSpan(
+            os.path.basename(dst), "copy", begin, end, tid=tid, args={"file": dst}
+        )
+        threadNames[tid] = threadName
+    workers = set()
+    for fullname, (begin, end, pid) in compileTimes.items():
+        traceSpan(
+            os.path.basename(fullname),
+            "compile",
+            begin,
+            end,
+            pid=pid,
+            tid=pid,
+            args={"file": fullname},
+        )
+        workers.add(pid)
+
+    metadata = [
+        {
+            "name": "process_name",
+            "ph": "M",
+            "pid": os.getpid(),
+            "tid": 0,
+            "args": {"name": "install.py"},
+        }
+    ]
+    metadata.extend(
+        {
+            "name": "thread_name",
+            "ph": "M",
+            "pid": os.getpid(),
+            "tid": tid,
+            "args": {"name": threadName},
+        }
+        for tid, threadName in threadNames.items()
+    )
+    metadata.extend(
+        {
+            "name": "process_name",
+            "ph": "M",
+            "pid": pid,
+            "tid": 0,
+            "args": {"name": "compile worker {0}".format(pid)},
+        }
+        for pid in workers
+        if pid != os.getpid()
+    )
+
+    try:
+        with open(fileName, "w", encoding="utf-8") as f:
+            json.dump(
+                {"traceEvents": metadata + traceEvents, "displayTimeUnit": "ms"}, f
+            )
+        print("The trace was written to '{0}'.".format(fileName))
+    except OSError as err:
+        print("The trace could not be written to '{0}': {1}".format(fileName, err))
+
+
+def tracedCopyFile(src, dst, perm):
+    """
+    Function to copy a single file and record the time needed for the trace.
+
+    @param src source file name
+    @type str
+    @param dst destination file name
+    @type str
+    @param perm permissions to be set
+    @type int
+    @return tuple containing the size, the modification time (in ns) and the
+        SHA-256 hash of the copied file (empty, if not calculated)
+    @rtype tuple of (int, int, str)
+    """
+    global copyTimes
+
+    start = time.monotonic()
+    try:
+        return copyFile(src, dst, perm)
+    finally:
+        copyTimes[dst] = (
+            start,
+            time.monotonic(),
+            threading.get_ident(),
+            threading.current_thread().name,
+        )
 
 
 def copyToFile(name, text):
@@ -247,6 +1138,7 @@ def copyToFile(name, text):
     """
     with open(name, "w") as f:
         f.write(text)
+    countWrittenFile(os.path.getsize(name))
 
 
 def copyDesktopFile(src, dst):
@@ -258,19 +1150,21 @@ def copyDesktopFile(src, dst):
     """
     global cfg, platBinDir
 
-    with open(src, "r", encoding="utf-8") as f:
-        text = f.read()
+    text = readSourceText(src)
 
     text = text.replace("@BINDIR@", platBinDir)
     text = text.replace("@MARKER@", "")
     text = text.replace("@PY_MARKER@", "")
 
-    dstPath = os.path.dirname(dst)
-    if not os.path.isdir(dstPath):
-        os.makedirs(dstPath)
+    if installArchive is not None:
+        writeArchiveEntry(dst, text.encode("utf-8"), 0o644)
+        return
+
+    makeDirs(os.path.dirname(dst))
     with open(dst, "w", encoding="utf-8") as f:
         f.write(text)
     os.chmod(dst, 0o644)
+    recordInstalledFile(dst)
 
 
 def copyAppStreamFile(src, dst):
@@ -280,7 +1174,14 @@ def copyAppStreamFile(src, dst):
     @param src source file name (string)
     @param dst destination file name (string)
     """
-    if os.path.exists(os.path.join("eric", "src", "eric7", "UI", "Info.py")):
+    infoName = os.path.join(eric7SourceDir, "UI", "Info.py")
+    if isArchiveSource(infoName):
+        # Installing from a release archive without extracting it
+        match = re.search(
+            r"^Version\s*=\s*['\"](.*)['\"]", readSourceText(infoName), re.MULTILINE
+        )
+        Version = match.group(1) if match else "Unknown"
+    elif os.path.exists(os.path.join("eric", "src", "eric7", "UI", "Info.py")):
         # Installing from installer archive
         from eric.src.eric7.UI.Info import Version
     elif os.path.exists(os.path.join("src", "eric7", "UI", "Info.py")):
@@ -289,8 +1190,7 @@ def copyAppStreamFile(src, dst):
     else:
         Version = "Unknown"
 
-    with open(src, "r", encoding="utf-8") as f:
-        text = f.read()
+    text = readSourceText(src)
 
     text = (
         text.replace("@MARKER@", "")
@@ -298,12 +1198,15 @@ def copyAppStreamFile(src, dst):
         .replace("@DATE@", time.strftime("%Y-%m-%d"))
     )
 
-    dstPath = os.path.dirname(dst)
-    if not os.path.isdir(dstPath):
-        os.makedirs(dstPath)
+    if installArchive is not None:
+        writeArchiveEntry(dst, text.encode("utf-8"), 0o644)
+        return
+
+    makeDirs(os.path.dirname(dst))
     with open(dst, "w", encoding="utf-8") as f:
         f.write(text)
     os.chmod(dst, 0o644)
+    recordInstalledFile(dst)
 
 
 def wrapperNames(dname, wfile):
@@ -335,22 +1238,42 @@ def createPyWrapper(pydir, wfile, saveDir, isGuiScript=True):
         application (boolean)
     @return the platform specific name of the wrapper (string)
     """
+    global zipBundle, zipBundleName
+
+    # the bundle of the eric modules has to be found first
+    if not zipBundle:
+        pathLine = ""
+    elif sys.platform.startswith(("win", "cygwin")):
+        pathLine = (
+            """@setlocal\n"""
+            """@if defined PYTHONPATH (set "PYTHONPATH={0};%PYTHONPATH%")"""
+            """ else (set "PYTHONPATH={0}")\n"""
+        ).format(os.path.join(pydir, zipBundleName))
+    else:
+        pathLine = """export PYTHONPATH="{0}${{PYTHONPATH:+:$PYTHONPATH}}"\n""".format(
+            os.path.join(pydir, zipBundleName)
+        )
+
     # all kinds of Windows systems
     if sys.platform.startswith(("win", "cygwin")):
         wname = wfile + ".cmd"
         if isGuiScript:
             wrapper = (
                 """@echo off\n"""
+                """{3}"""
                 '''start "" "{2}\\pythonw.exe"'''
                 ''' "{0}\\{1}.pyw"'''
                 """ %1 %2 %3 %4 %5 %6 %7 %8 %9\n""".format(
-                    pydir, wfile, os.path.dirname(sys.executable)
+                    pydir, wfile, os.path.dirname(sys.executable), pathLine
                 )
             )
         else:
             wrapper = (
+                """{3}"""
                 '''@"{0}" "{1}\\{2}.py"'''
-                """ %1 %2 %3 %4 %5 %6 %7 %8 %9\n""".format(sys.executable, pydir, wfile)
+                """ %1 %2 %3 %4 %5 %6 %7 %8 %9\n""".format(
+                    sys.executable, pydir, wfile, pathLine
+                )
             )
 
     # Mac OS X
@@ -363,7 +1286,8 @@ def createPyWrapper(pydir, wfile, saveDir, isGuiScript=True):
         wrapper = (
             """#!/bin/sh\n"""
             """\n"""
-            """exec "{0}" "{1}/{2}.py" "$@"\n""".format(pyexec, pydir, wfile)
+            """{3}"""
+            """exec "{0}" "{1}/{2}.py" "$@"\n""".format(pyexec, pydir, wfile, pathLine)
         )
 
     # *nix systems
@@ -372,7 +1296,10 @@ def createPyWrapper(pydir, wfile, saveDir, isGuiScript=True):
         wrapper = (
             """#!/bin/sh\n"""
             """\n"""
-            """exec "{0}" "{1}/{2}.py" "$@"\n""".format(sys.executable, pydir, wfile)
+            """{3}"""
+            """exec "{0}" "{1}/{2}.py" "$@"\n""".format(
+                sys.executable, pydir, wfile, pathLine
+            )
         )
 
     wname = os.path.join(saveDir, wname)
@@ -382,6 +1309,110 @@ def createPyWrapper(pydir, wfile, saveDir, isGuiScript=True):
     return wname
 
 
+def compileFilters(patterns):
+    """
+    Function to compile a list of filter patterns into a single matcher.
+
+    @param patterns list of filter patterns
+    @type list of str
+    @return match function of the compiled patterns or None, if no patterns
+        were given
+    @rtype function
+    """
+    if not patterns:
+        return None
+
+    return re.compile(
+        "|".join(
+            "(?:{0})".format(fnmatch.translate(os.path.normcase(p))) for p in patterns
+        )
+    ).match
+
+
+def createInstallPlan(filterSets, excludeDirs=None):
+    """
+    Function to create the list of files to be installed.
+
+    The source directories are traversed in one pass only, even if the
+    directories of some filter sets are nested within those of others.
+    Like with the former recursive copy, the filter patterns are matched
+    against the complete source path and the exclude patterns against the
+    file or directory name.
+
+    @param filterSets list of tuples containing the source directory, the
+        destination directory, a list of filter patterns determining the
+        files to be copied and a list of filter patterns determining the
+        files and directories to be skipped
+    @type list of tuple of (str, str, list of str, list of str)
+    @param excludeDirs list of (sub)directories to exclude from copying
+    @type list of str
+    @return list of tuples containing the source file name, the destination
+        file name and the permissions to be set
+    @rtype list of tuple of (str, str, int)
+    """
+    excludeDirs = {os.path.normpath(d) for d in excludeDirs or []}
+
+    matchers = []
+    roots = {}
+    for index, (src, _dst, filters, excludePatterns) in enumerate(filterSets):
+        matchers.append((compileFilters(filters), compileFilters(excludePatterns)))
+        roots.setdefault(os.path.normpath(src), []).append(index)
+
+    # directories containing a filter set root have to be traversed even if
+    # no filter set is active in them
+    rootParents = set()
+    for root in roots:
+        parent = os.path.dirname(root)
+        while parent and parent not in rootParents and parent not in roots:
+            rootParents.add(parent)
+            if os.path.dirname(parent) == parent:
+                break
+            parent = os.path.dirname(parent)
+
+    plan = []
+    stack = [
+        (root, [(index, filterSets[index][1]) for index in indexes])
+        for root, indexes in roots.items()
+        if not any(root.startswith(other + os.sep) for other in roots if other != root)
+    ]
+    while stack:
+        directory, activeSets = stack.pop()
+        try:
+            entries = listSourceDir(directory)
+        except OSError:
+            # ignore missing directories (most probably the i18n directory)
+            continue
+
+        for entryName, entryPath, isDir in entries:
+            name = os.path.normcase(entryName)
+            srcname = os.path.normcase(entryPath)
+
+            if isDir:
+                if entryPath in excludeDirs:
+                    continue
+                subSets = []
+                for index, dst in activeSets:
+                    fileFilter, excludeFilter = matchers[index]
+                    if excludeFilter and excludeFilter(name):
+                        continue
+                    if not fileFilter(srcname):
+                        subSets.append((index, os.path.join(dst, entryName)))
+                subSets.extend(
+                    (index, filterSets[index][1]) for index in roots.get(entryPath, [])
+                )
+                if subSets or entryPath in rootParents:
+                    stack.append((entryPath, subSets))
+            else:
+                for index, dst in activeSets:
+                    fileFilter, excludeFilter = matchers[index]
+                    if excludeFilter and excludeFilter(name):
+                        continue
+                    if fileFilter(srcname):
+                        plan.append((entryPath, os.path.join(dst, entryName), 0o644))
+
+    return plan
+
+
 def copyTree(src, dst, filters, excludeDirs=None, excludePatterns=None):
     """
     Copy Python, translation, documentation, wizards configuration,
@@ -394,58 +1425,1479 @@ def copyTree(src, dst, filters, excludeDirs=None, excludePatterns=None):
     @param excludePatterns list of filter pattern determining the files to
         be skipped
     """
-    if excludeDirs is None:
-        excludeDirs = []
-    if excludePatterns is None:
-        excludePatterns = []
-    try:
-        names = os.listdir(src)
-    except OSError:
-        # ignore missing directories (most probably the i18n directory)
-        return
+    copyFiles(
+        createInstallPlan([(src, dst, filters, excludePatterns or [])], excludeDirs)
+    )
 
-    for name in names:
-        skipIt = False
-        for excludePattern in excludePatterns:
-            if fnmatch.fnmatch(name, excludePattern):
-                skipIt = True
-                break
-        if not skipIt:
-            srcname = os.path.join(src, name)
-            dstname = os.path.join(dst, name)
-            for fileFilter in filters:
-                if fnmatch.fnmatch(srcname, fileFilter):
-                    if not os.path.isdir(dst):
-                        os.makedirs(dst)
-                    shutil.copy2(srcname, dstname)
-                    os.chmod(dstname, 0o644)
-                    break
-            else:
-                if os.path.isdir(srcname) and srcname not in excludeDirs:
-                    copyTree(srcname, dstname, filters, excludePatterns=excludePatterns)
 
+def workerCount():
+    """
+    Function to determine the number of parallel workers to be used.
 
-def createGlobalPluginsDir():
+    @return number of workers
+    @rtype int
     """
-    Create the global plugins directory, if it doesn't exist.
+    global installJobs
+
+    return installJobs if installJobs > 0 else os.cpu_count() or 1
+
+
+def processPool(workers):
     """
-    global cfg, distDir
+    Function to create a pool of worker processes.
 
-    pdir = os.path.join(cfg["mdir"], "eric7plugins")
-    fname = os.path.join(pdir, "__init__.py")
-    if not os.path.exists(fname):
-        if not os.path.exists(pdir):
-            os.mkdir(pdir, 0o755)
-        with open(fname, "w") as f:
-            f.write(
-                '''# -*- coding: utf-8 -*-
+    The workers are not forked from the installer, because it runs phases in
+    several threads and a forked child may inherit locks held by another
+    thread. They are started by the fork server instead, or as fresh
+    interpreters where that is not available (e.g. on Windows).
+
+    @param workers number of worker processes
+    @type int
+    @return pool of worker processes
+    @rtype concurrent.futures.ProcessPoolExecutor
+    """
+    context = multiprocessing.get_context(
+        "forkserver"
+        if "forkserver" in multiprocessing.get_all_start_methods()
+        else "spawn"
+    )
+    return concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers, mp_context=context
+    )
+
+
+def isArchiveSource(path):
+    """
+    Function to check, if a path refers to the contents of the release
+    archive being installed from.
+
+    @param path path to be checked
+    @type str
+    @return flag indicating a path within the release archive
+    @rtype bool
+    """
+    global sourceArchiveName
+
+    return bool(sourceArchiveName) and (
+        path == sourceArchiveName or path.startswith(sourceArchiveName + os.sep)
+    )
+
+
+def addSourceMember(path, data, mtimeNs):
+    """
+    Add a file to the in-memory contents of the release archive.
+
+    @param path path of the file below the archive file name
+    @type str
+    @param data contents of the file
+    @type bytes
+    @param mtimeNs modification time of the file (in ns)
+    @type int
+    """
+    global sourceArchiveName, sourceArchive, sourceArchiveDirs
+
+    sourceArchive[path] = [data, mtimeNs]
+    isDir = False
+    while path != sourceArchiveName:
+        parent, name = os.path.split(path)
+        entries = sourceArchiveDirs.setdefault(parent, {})
+        known = name in entries
+        entries[name] = isDir
+        if known:
+            break
+        path, isDir = parent, True
+
+
+def removeSourceFile(path):
+    """
+    Delete a source file.
+
+    Files of the release archive are only removed from its in-memory
+    contents.
+
+    @param path name of the file
+    @type str
+    """
+    global sourceArchive, sourceArchiveDirs
+
+    if isArchiveSource(path):
+        sourceArchive.pop(path, None)
+        sourceArchiveDirs.get(os.path.dirname(path), {}).pop(
+            os.path.basename(path), None
+        )
+    else:
+        os.remove(path)
+
+
+def readTarMembers(archive):
+    """
+    Function to read the regular files of a tar archive opened as a stream.
+
+    @param archive tar archive
+    @type tarfile.TarFile
+    @return list of tuples containing the member name, its contents and its
+        modification time (in ns)
+    @rtype list of tuple of (str, bytes, int)
+    """
+    return [
+        (info.name, archive.extractfile(info).read(), int(info.mtime) * 1000000000)
+        for info in archive
+        if info.isfile()
+    ]
+
+
+def readSourceArchive(fileName):
+    """
+    Function to read a release archive to install from.
+
+    The archive is read in one pass and its files are kept in memory. They
+    are addressed by paths below the archive file name, so that the source
+    directory of the installation is a path within the archive.
+
+    @param fileName name of the release archive (.zip, .tar.zst, .tzst or any
+        tar archive supported by the tarfile module)
+    @type str
+    @return name of the eric source directory within the archive
+    @rtype str
+    """
+    global sourceArchiveName, sourceArchive
+
+    sourceArchiveName = os.path.abspath(fileName)
+    try:
+        if fileName.endswith(".zip"):
+            with zipfile.ZipFile(fileName) as archive:
+                members = [
+                    (
+                        info.filename,
+                        archive.read(info),
+                        int(time.mktime(info.date_time + (0, 0, -1))) * 1000000000,
+                    )
+                    for info in archive.infolist()
+                    if not info.is_dir()
+                ]
+        elif fileName.endswith((".tar.zst", ".tzst")):
+            try:
+                import zstandard
+            except ImportError:
+                print(
+                    "The 'zstandard' package is needed to read '{0}'.".format(fileName)
+                )
+                exit(1)
+            with open(fileName, "rb") as f, tarfile.open(
+                fileobj=zstandard.ZstdDecompressor().stream_reader(f), mode="r|"
+            ) as archive:
+                members = readTarMembers(archive)
+        else:
+            with tarfile.open(fileName, "r|*") as archive:
+                members = readTarMembers(archive)
+    except (OSError, EOFError, tarfile.TarError, zipfile.BadZipFile) as err:
+        print("The release archive '{0}' could not be read: {1}".format(fileName, err))
+        exit(1)
+
+    for name, data, mtimeNs in members:
+        parts = [p for p in name.replace("\\", "/").split("/") if p not in ("", ".")]
+        if parts and ".." not in parts:
+            addSourceMember(os.path.join(sourceArchiveName, *parts), data, mtimeNs)
+
+    packages = sorted(
+        (
+            os.path.dirname(path)
+            for path in sourceArchive
+            if os.path.basename(path) == "__init__.py"
+            and os.path.basename(os.path.dirname(path)) == "eric7"
+        ),
+        key=len,
+    )
+    if not packages:
+        print("'{0}' is not an eric release archive.".format(fileName))
+        exit(1)
+
+    # the release archives contain 'eric/eric7', the source tree 'src/eric7'
+    parent = os.path.dirname(packages[0])
+    return os.path.dirname(parent) if os.path.basename(parent) == "src" else parent
+
+
+def sourceExists(path):
+    """
+    Function to check, if a source file or directory exists.
+
+    @param path name of the file or directory
+    @type str
+    @return flag indicating an existing file or directory
+    @rtype bool
+    """
+    global sourceArchive, sourceArchiveDirs
+
+    if isArchiveSource(path):
+        return path in sourceArchive or path in sourceArchiveDirs
+
+    return os.path.exists(path)
+
+
+def listSourceDir(directory, followSymlinks=True):
+    """
+    Function to list the entries of a source directory.
+
+    @param directory name of the directory
+    @type str
+    @param followSymlinks flag indicating to report symbolic links to
+        directories as directories
+    @type bool
+    @return list of tuples containing the name and the path of an entry and a
+        flag indicating a directory
+    @rtype list of tuple of (str, str, bool)
+    @exception FileNotFoundError raised to indicate a directory not contained
+        in the release archive
+    """
+    global sourceArchiveDirs
+
+    if isArchiveSource(directory):
+        if directory not in sourceArchiveDirs:
+            raise FileNotFoundError(directory)
+        return [
+            (name, os.path.join(directory, name), isDir)
+            for name, isDir in sourceArchiveDirs[directory].items()
+        ]
+
+    entries = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            try:
+                isDir = entry.is_dir(follow_symlinks=followSymlinks)
+            except OSError:
+                isDir = False
+            entries.append((entry.name, entry.path, isDir))
+    return entries
+
+
+def walkSource(top):
+    """
+    Function to walk a source directory tree like os.walk() does.
+
+    @param top name of the top level directory
+    @type str
+    @yield tuple containing a directory name and lists of its subdirectories
+        and files
+    @ytype tuple of (str, list of str, list of str)
+    """
+    if not isArchiveSource(top):
+        yield from os.walk(top)
+        return
+
+    directories = [top]
+    while directories:
+        directory = directories.pop()
+        try:
+            entries = listSourceDir(directory)
+        except OSError:
+            continue
+        dirNames = [name for name, _, isDir in entries if isDir]
+        yield directory, dirNames, [name for name, _, isDir in entries if not isDir]
+        directories.extend(os.path.join(directory, name) for name in dirNames)
+
+
+def globSource(pattern):
+    """
+    Function to get the source files matching a pattern.
+
+    Only the last path component of the pattern may contain wildcards.
+
+    @param pattern file name pattern
+    @type str
+    @return list of matching files
+    @rtype list of str
+    """
+    global sourceArchiveDirs
+
+    if not isArchiveSource(pattern):
+        return glob.glob(pattern)
+
+    directory, namePattern = os.path.split(pattern)
+    return [
+        os.path.join(directory, name)
+        for name, isDir in sourceArchiveDirs.get(directory, {}).items()
+        if not isDir and not name.startswith(".") and fnmatch.fnmatch(name, namePattern)
+    ]
+
+
+def readSourceFile(path):
+    """
+    Function to read the contents of a source file.
+
+    @param path name of the file
+    @type str
+    @return contents of the file
+    @rtype bytes
+    @exception FileNotFoundError raised to indicate a file not contained in
+        the release archive
+    """
+    global sourceArchive
+
+    if isArchiveSource(path):
+        if path not in sourceArchive:
+            raise FileNotFoundError(path)
+        return sourceArchive[path][0]
+
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def readSourceText(path):
+    """
+    Function to read the contents of a UTF-8 encoded source file.
+
+    @param path name of the file
+    @type str
+    @return contents of the file
+    @rtype str
+    """
+    with io.TextIOWrapper(io.BytesIO(readSourceFile(path)), encoding="utf-8") as f:
+        return f.read()
+
+
+def sourceStat(path):
+    """
+    Function to get the size and the access and modification times of a
+    source file.
+
+    Files of the release archive report their modification time as the
+    access time.
+
+    @param path name of the file
+    @type str
+    @return tuple containing the size and the access and modification times
+        (in ns) of the file
+    @rtype tuple of (int, int, int)
+    @exception FileNotFoundError raised to indicate a file not contained in
+        the release archive
+    """
+    global sourceArchive
+
+    if isArchiveSource(path):
+        if path not in sourceArchive:
+            raise FileNotFoundError(path)
+        data, mtimeNs = sourceArchive[path]
+        return len(data), mtimeNs, mtimeNs
+
+    st = os.stat(path)
+    return st.st_size, st.st_atime_ns, st.st_mtime_ns
+
+
+def extractSourceFile(src, dst, perm):
+    """
+    Function to write a file of the release archive to its destination.
+
+    @param src name of the file within the release archive
+    @type str
+    @param dst destination file name
+    @type str
+    @param perm permissions to be set
+    @type int
+    @return tuple containing the size, the modification time (in ns) and the
+        SHA-256 hash of the written file
+    @rtype tuple of (int, int, str)
+    """
+    data = readSourceFile(src)
+    mtimeNs = sourceStat(src)[2]
+    # never write through a hard link to the file of a former installation
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(dst)
+    with open(dst, "wb") as f:
+        f.write(data)
+    os.utime(dst, ns=(mtimeNs, mtimeNs))
+    os.chmod(dst, perm)
+
+    st = os.stat(dst)
+    return st.st_size, st.st_mtime_ns, hashlib.sha256(data).hexdigest()
+
+
+def unlinkSameFile(src, dst):
+    """
+    Remove the destination file, if it is a hard link to the source file.
+
+    This prevents writing the destination from truncating the source.
+
+    @param src source file name
+    @type str
+    @param dst destination file name
+    @type str
+    """
+    with contextlib.suppress(OSError):
+        if os.path.samefile(src, dst):
+            os.remove(dst)
+
+
+def cloneFile(src, dst, perm):
+    """
+    Function to create a file sharing the data of the source file according
+    to the selected copy strategy.
+
+    The 'hardlink' strategy links the files, if the source has the requested
+    permissions. Otherwise and for the 'reflink' and 'auto' strategies the
+    file is cloned via the FICLONE ioctl. The 'auto' strategy uses
+    copy_file_range() as the next choice. Methods not supported by the file
+    system are not tried again.
+
+    @param src source file name
+    @type str
+    @param dst destination file name
+    @type str
+    @param perm permissions to be set
+    @type int
+    @return flag indicating the file was created (False means, that it has to
+        be copied)
+    @rtype bool
+    """
+    global copyStrategy, cloneMethods
+
+    if copyStrategy == "copy":
+        return False
+
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(dst)
+
+    if (
+        copyStrategy == "hardlink"
+        and cloneMethods["hardlink"]
+        and stat.S_IMODE(os.stat(src).st_mode) == perm
+    ):
+        try:
+            os.link(src, dst)
+            return True
+        except OSError:
+            cloneMethods["hardlink"] = False
+
+    if cloneMethods["reflink"]:
+        try:
+            import fcntl
+
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), 0x40049409, fsrc.fileno())  # FICLONE
+            shutil.copystat(src, dst)
+            os.chmod(dst, perm)
+            return True
+        except (ImportError, OSError):
+            cloneMethods["reflink"] = False
+
+    if copyStrategy == "auto" and cloneMethods["copy_file_range"]:
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            shutil.copystat(src, dst)
+            os.chmod(dst, perm)
+            return True
+        except (AttributeError, OSError):
+            # os.copy_file_range() is available on Linux with Python 3.8+
+            cloneMethods["copy_file_range"] = False
+
+    return False
+
+
+def copyFile(src, dst, perm=0o644):
+    """
+    Copy a single file including its meta data and set its permissions.
+
+    The content hash of the file is calculated while copying it. Files
+    created according to a copy strategy sharing the data are not hashed.
+
+    @param src source file name
+    @type str
+    @param dst destination file name
+    @type str
+    @param perm permissions to be set
+    @type int
+    @return tuple containing the size, the modification time (in ns) and the
+        SHA-256 hash of the copied file (empty, if not calculated)
+    @rtype tuple of (int, int, str)
+    """
+    if isArchiveSource(src):
+        return extractSourceFile(src, dst, perm)
+
+    if cloneFile(src, dst, perm):
+        st = os.stat(dst)
+        return st.st_size, st.st_mtime_ns, ""
+
+    unlinkSameFile(src, dst)
+    digest = hashlib.sha256()
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        while True:
+            buf = fsrc.read(1024 * 1024)
+            if not buf:
+                break
+            digest.update(buf)
+            fdst.write(buf)
+    shutil.copystat(src, dst)
+    os.chmod(dst, perm)
+
+    st = os.stat(dst)
+    return st.st_size, st.st_mtime_ns, digest.hexdigest()
+
+
+def fileHash(name):
+    """
+    Function to calculate the SHA-256 hash of a file.
+
+    @param name name of the file
+    @type str
+    @return SHA-256 hash of the file contents
+    @rtype str
+    """
+    if isArchiveSource(name):
+        return hashlib.sha256(readSourceFile(name)).hexdigest()
+
+    digest = hashlib.sha256()
+    with open(name, "rb") as f:
+        while True:
+            buf = f.read(1024 * 1024)
+            if not buf:
+                break
+            digest.update(buf)
+    return digest.hexdigest()
+
+
+def openArchive(fileName):
+    """
+    Open the archive the installation is written to.
+
+    The kind of archive is determined by the file name extension. Tar
+    archives are written as a stream.
+
+    @param fileName name of the archive (.tar.gz, .tgz, .tar.zst, .tzst or
+        .zip)
+    @type str
+    """
+    global installArchive, installArchiveFiles
+
+    if fileName.endswith((".tar.gz", ".tgz")):
+        installArchive = tarfile.open(fileName, "w|gz")
+    elif fileName.endswith((".tar.zst", ".tzst")):
+        try:
+            import zstandard
+        except ImportError:
+            print("The 'zstandard' package is needed to write '{0}'.".format(fileName))
+            exit(1)
+        f = open(fileName, "wb")
+        writer = zstandard.ZstdCompressor().stream_writer(f)
+        installArchiveFiles = [writer, f]
+        installArchive = tarfile.open(fileobj=writer, mode="w|")
+    else:
+        installArchive = zipfile.ZipFile(fileName, "w", zipfile.ZIP_DEFLATED)
+
+
+def closeArchive():
+    """
+    Finish the archive the installation was written to.
+    """
+    global installArchive, installArchiveFiles
+
+    if installArchive is not None:
+        installArchive.close()
+        for f in installArchiveFiles:
+            f.close()
+        installArchive = None
+        installArchiveFiles = []
+
+
+def discardArchive(fileName):
+    """
+    Close and remove the archive of a failed installation.
+
+    @param fileName name of the archive
+    @type str
+    """
+    global installArchive, installArchiveFiles
+
+    if installArchive is not None:
+        with contextlib.suppress(Exception):
+            closeArchive()
+        installArchive = None
+        installArchiveFiles = []
+        with contextlib.suppress(OSError):
+            os.remove(fileName)
+
+
+def archiveName(path):
+    """
+    Function to get the name of an archive entry.
+
+    @param path name of the file on the target system including the install
+        prefix
+    @type str
+    @return name of the archive entry
+    @rtype str
+    """
+    return installedPath(path).lstrip(os.sep).replace(os.sep, "/")
+
+
+def writeArchiveEntry(path, data, perm, mtime=None, record=True):
+    """
+    Write a file entry to the archive.
+
+    @param path name of the file on the target system including the install
+        prefix
+    @type str
+    @param data contents of the file
+    @type bytes
+    @param perm permissions of the file
+    @type int
+    @param mtime modification time of the file (defaults to now)
+    @type float
+    @param record flag indicating to record the file in the install manifest
+    @type bool
+    """
+    global installArchive, installManifest, installStateLock
+
+    mtime = int(time.time() if mtime is None else mtime)
+    name = archiveName(path)
+    if isinstance(installArchive, zipfile.ZipFile):
+        info = zipfile.ZipInfo(name, time.localtime(mtime)[:6])
+        info.create_system = 3  # Unix, so that the permissions are honored
+        info.external_attr = (stat.S_IFREG | perm) << 16
+        info.compress_type = zipfile.ZIP_DEFLATED
+        installArchive.writestr(info, data)
+    else:
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mode = perm
+        info.mtime = mtime
+        info.uname = info.gname = "root"
+        installArchive.addfile(info, io.BytesIO(data))
+
+    countWrittenFile(len(data))
+    if record:
+        with installStateLock:
+            installManifest[installedPath(path)] = [
+                len(data),
+                mtime * 1000000000,
+                hashlib.sha256(data).hexdigest(),
+            ]
+
+
+def writeArchiveDirectory(path):
+    """
+    Write a directory entry to the archive.
+
+    @param path name of the directory on the target system including the
+        install prefix
+    @type str
+    """
+    global installArchive
+
+    name = archiveName(path) + "/"
+    if isinstance(installArchive, zipfile.ZipFile):
+        info = zipfile.ZipInfo(name, time.localtime()[:6])
+        info.create_system = 3
+        info.external_attr = (stat.S_IFDIR | 0o755) << 16
+        installArchive.writestr(info, b"")
+    else:
+        info = tarfile.TarInfo(name)
+        info.type = tarfile.DIRTYPE
+        info.mode = 0o755
+        info.mtime = int(time.time())
+        info.uname = info.gname = "root"
+        installArchive.addfile(info)
+
+
+def archiveFile(src, dst, perm=0o644):
+    """
+    Write a file to the archive.
+
+    @param src source file name
+    @type str
+    @param dst destination file name including the install prefix
+    @type str
+    @param perm permissions to be set
+    @type int
+    """
+    writeArchiveEntry(dst, readSourceFile(src), perm, sourceStat(src)[2] / 1e9)
+
+
+def installedPath(path):
+    """
+    Function to get the path a file will have on the target system.
+
+    @param path name of the file as written by the installer
+    @type str
+    @return name of the file without the temporary install prefix
+    @rtype str
+    """
+    global distDir, stagingDir, stagedEricDir, stagedFiles
+
+    if stagingDir and (path == stagingDir or path.startswith(stagingDir + os.sep)):
+        path = stagedEricDir + path[len(stagingDir) :]
+    path = stagedFiles.get(path, path)
+    if distDir and path.startswith(distDir + os.sep):
+        return path[len(distDir) :]
+    return path
+
+
+def actualPath(path):
+    """
+    Function to get the path a file is written to by the installer.
+
+    @param path name of the file on the target system
+    @type str
+    @return name of the file including the temporary install prefix
+    @rtype str
+    """
+    global distDir
+
+    if distDir:
+        return os.path.normpath(os.path.join(distDir, path.lstrip(os.sep)))
+    return path
+
+
+def makeDirs(path):
+    """
+    Create a directory including its parents, if it doesn't exist yet.
+
+    Directories known to exist are cached in order to save the file system
+    accesses for directories shared by many files. The created directories
+    are recorded for the install manifest. Phases running concurrently are
+    serialized by the lock of the installation state.
+
+    @param path name of the directory
+    @type str
+    """
+    global distDir, knownDirs, installDirectories, installArchive, cfg
+    global installStateLock
+
+    with installStateLock:
+        if path and path not in knownDirs and installArchive is not None:
+            # only the directories owned by eric get an entry of their own
+            ericDir = cfg["ericDir"]
+            if path == ericDir or path.startswith(ericDir + os.sep):
+                writeArchiveDirectory(path)
+                installDirectories.add(installedPath(path))
+            knownDirs.add(path)
+        elif path and path not in knownDirs:
+            if not os.path.isdir(path):
+                created = []
+                directory = os.path.normpath(path)
+                while not os.path.isdir(directory):
+                    created.append(directory)
+                    parent = os.path.dirname(directory)
+                    if parent == directory:
+                        break
+                    directory = parent
+                os.makedirs(path, exist_ok=True)
+                installDirectories.update(
+                    installedPath(d)
+                    for d in created
+                    if not distDir or d.startswith(distDir + os.sep)
+                )
+            knownDirs.add(path)
+
+
+def recordInstalledFile(name):
+    """
+    Record a file written by the installer in the install manifest.
+
+    @param name name of the file
+    @type str
+    """
+    global installManifest, installArchive, installStateLock
+
+    if installArchive is not None:
+        # archive entries are recorded when they are written
+        return
+
+    st = os.lstat(name)
+    digest = fileHash(name) if stat.S_ISREG(st.st_mode) else ""
+    with installStateLock:
+        installManifest[installedPath(name)] = [st.st_size, st.st_mtime_ns, digest]
+    countWrittenFile(st.st_size)
+
+
+def copyFiles(fileList):
+    """
+    Copy a list of files concurrently using a pool of worker threads.
+
+    The destination directories are created upfront in order to not have
+    the workers race for them. The copied files are recorded in the install
+    manifest. When writing an archive, the files are added to it instead.
+
+    @param fileList list of tuples containing the source file name, the
+        destination file name and the permissions to be set
+    @type list of tuple of (str, str, int)
+    @exception OSError raised to report the first file, that could not be
+        copied
+    """
+    global installJobs, installManifest, installArchive, installStateLock
+
+    for dstDir in sorted({os.path.dirname(dst) for _, dst, _ in fileList}):
+        makeDirs(dstDir)
+
+    if installArchive is not None:
+        # archive entries have to be written one after the other
+        for src, dst, perm in fileList:
+            archiveFile(src, dst, perm)
+        return
+
+    # copying is I/O bound, so use more threads than there are CPUs
+    maxWorkers = installJobs if installJobs > 0 else min(32, workerCount() + 4)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+        futures = [
+            executor.submit(
+                tracedCopyFile if traceFileName else copyFile, src, dst, perm
+            )
+            for src, dst, perm in fileList
+        ]
+        _, notDone = concurrent.futures.wait(
+            futures, return_when=concurrent.futures.FIRST_EXCEPTION
+        )
+        for future in notDone:
+            future.cancel()
+    for future in futures:
+        if not future.cancelled() and future.exception() is not None:
+            raise future.exception()
+
+    with installStateLock:
+        for (_, dst, _), future in zip(fileList, futures):
+            installManifest[installedPath(dst)] = list(future.result())
+    for future in futures:
+        countWrittenFile(future.result()[0])
+
+
+def readInstallManifest(fileName):
+    """
+    Function to read the manifest of a previous installation.
+
+    @param fileName name of the manifest file
+    @type str
+    @return tuple containing a dictionary with the size, the modification time
+        (in ns) and the SHA-256 hash for each installed file and a list of
+        the created directories (both empty, if no valid manifest was found)
+    @rtype tuple of (dict, list of str)
+    """
+    try:
+        with open(fileName, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        return dict(manifest["files"]), list(manifest.get("directories", []))
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return {}, []
+
+
+def writeInstallManifest(fileName):
+    """
+    Write the manifest of the installed files.
+
+    @param fileName name of the manifest file
+    @type str
+    """
+    global installManifest, installDirectories, installArchive
+
+    manifest = {"files": installManifest, "directories": sorted(installDirectories)}
+    if installArchive is not None:
+        writeArchiveEntry(
+            fileName,
+            json.dumps(manifest, sort_keys=True).encode("utf-8"),
+            0o644,
+            record=False,
+        )
+        return
+
+    with open(fileName, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, sort_keys=True)
+    os.chmod(fileName, 0o644)
+    countWrittenFile(os.path.getsize(fileName))
+
+
+def unchangedEntry(src, dst, perm, entry):
+    """
+    Function to check, if an installed file is identical to its source.
+
+    A file is unchanged, if it still matches its manifest entry and the
+    source has the recorded size and modification time. Sources with a
+    different modification time are compared by their content hash and
+    only get the modification time of the installed file updated.
+
+    @param src source file name
+    @type str
+    @param dst destination file name
+    @type str
+    @param perm permissions of the installed file
+    @type int
+    @param entry manifest entry of the installed file
+    @type list of (int, int, str)
+    @return manifest entry for an unchanged file or None
+    @rtype list of (int, int, str)
+    """
+    if not entry:
+        return None
+
+    try:
+        srcSize, srcAtime, srcMtime = sourceStat(src)
+        dstStat = os.stat(dst)
+        size, mtime, digest = entry
+        if (
+            srcSize != size
+            or dstStat.st_size != size
+            or dstStat.st_mtime_ns != mtime
+            or stat.S_IMODE(dstStat.st_mode) != perm
+        ):
+            return None
+
+        if srcMtime != mtime:
+            if not digest or fileHash(src) != digest:
+                return None
+            os.utime(dst, ns=(srcAtime, srcMtime))
+            mtime = os.stat(dst).st_mtime_ns
+    except (OSError, ValueError, TypeError):
+        return None
+
+    return [size, mtime, digest]
+
+
+def changedFiles(fileList, manifest):
+    """
+    Function to determine the files, that differ from a previous
+    installation.
+
+    Unchanged files are taken over into the install manifest.
+
+    @param fileList list of tuples containing the source file name, the
+        destination file name and the permissions to be set
+    @type list of tuple of (str, str, int)
+    @param manifest manifest of the previous installation
+    @type dict
+    @return list of tuples containing the source file name, the destination
+        file name and the permissions of the files to be copied
+    @rtype list of tuple of (str, str, int)
+    """
+    global installManifest, installStateLock
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(32, workerCount() + 4)
+    ) as executor:
+        entries = list(
+            executor.map(
+                lambda f: unchangedEntry(*f, manifest.get(installedPath(f[1]))),
+                fileList,
+            )
+        )
+
+    changed = []
+    with installStateLock:
+        for fileEntry, entry in zip(fileList, entries):
+            if entry is None:
+                changed.append(fileEntry)
+            else:
+                installManifest[installedPath(fileEntry[1])] = entry
+    return changed
+
+
+def removeObsoleteFiles(manifest, directories):
+    """
+    Remove the files of a previous installation, that are not part of the
+    current one, and the directories left empty.
+
+    Only directories within the eric directory or recorded as created by
+    the previous installation are removed, that are not used by the current
+    one.
+
+    @param manifest manifest of the previous installation
+    @type dict
+    @param directories list of the directories created by the previous
+        installation
+    @type list of str
+    """
+    global installManifest, knownDirs, cfg
+
+    ericDir = os.path.normpath(cfg["ericDir"])
+    createdDirs = {actualPath(d) for d in directories}
+
+    emptied = set()
+    for path in set(manifest) - set(installManifest):
+        name = actualPath(path)
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(name)
+        emptied.add(os.path.dirname(name))
+
+    for directory in sorted(emptied, key=len, reverse=True):
+        with contextlib.suppress(OSError):
+            while (
+                directory in createdDirs or directory.startswith(ericDir + os.sep)
+            ) and directory not in knownDirs:
+                os.rmdir(directory)
+                directory = os.path.dirname(directory)
+
+
+def removeInstalledFiles(manifest, directories):
+    """
+    Remove the files and directories recorded in an install manifest.
+
+    The files are removed first together with the byte code cached for
+    them at runtime. Afterwards the directories are removed bottom-up, if
+    they are empty.
+
+    @param manifest dictionary of the installed files
+    @type dict
+    @param directories list of the created directories
+    @type list of str
+    """
+    for path in sorted(manifest):
+        name = actualPath(path)
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(name)
+        if name.endswith(".py"):
+            dirName, baseName = os.path.split(name)
+            for cacheFile in glob.glob(
+                os.path.join(
+                    glob.escape(dirName),
+                    "__pycache__",
+                    glob.escape(baseName[:-3]) + ".*.pyc",
+                )
+            ):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(cacheFile)
+
+    for path in sorted(directories, key=lambda d: d.count(os.sep), reverse=True):
+        name = actualPath(path)
+        with contextlib.suppress(OSError):
+            os.rmdir(os.path.join(name, "__pycache__"))
+        with contextlib.suppress(OSError):
+            os.rmdir(name)
+
+
+def uninstallEric():
+    """
+    Uninstall eric based on the manifest of its installation.
+
+    Installations without a manifest are removed by evaluating their
+    configuration file.
+
+    @return result code
+    @rtype int
+    """
+    global cfg, distDir
+
+    if len(cfg) == 0:
+        createInstallConfig()
+
+    manifestFile = os.path.join(actualPath(cfg["ericDir"]), installManifestName)
+    manifest, directories = readInstallManifest(manifestFile)
+    print("Uninstalling eric ...")
+    if not manifest:
+        print("No manifest of the installation found.")
+        if not distDir:
+            cleanUp()
+        return 0
+
+    filesCount = len(manifest)
+    # the manifest is removed together with the files it lists
+    manifest[installedPath(manifestFile)] = []
+    try:
+        removeInstalledFiles(manifest, directories)
+    except OSError as msg:
+        sys.stderr.write("Error: {0}\nTry uninstall with admin rights.\n".format(msg))
+        return 7
+
+    print("Removed {0} files.".format(filesCount))
+    return 0
+
+
+def siblingName(path, kind):
+    """
+    Function to get a unique name for a hidden directory or file next to the
+    given one.
+
+    @param path name of the directory or file
+    @type str
+    @param kind kind of the sibling (i.e. 'tombstone', 'staging' or 'staged')
+    @type str
+    @return name of the sibling
+    @rtype str
+    """
+    dirName, baseName = os.path.split(os.path.normpath(path))
+    return os.path.join(
+        dirName,
+        ".{0}.{1}-{2}-{3:x}".format(baseName, kind, os.getpid(), time.time_ns()),
+    )
+
+
+def isProcessRunning(pid):
+    """
+    Function to check, if a process is still running.
+
+    @param pid ID of the process
+    @type int
+    @return flag indicating a running process (True, if it cannot be
+        determined)
+    @rtype bool
+    """
+    if pid == os.getpid():
+        return True
+
+    if sys.platform.startswith(("win", "cygwin")):
+        # os.kill() would terminate the process on Windows
+        try:
+            import ctypes
+
+            kernel32 = ctypes.windll.kernel32
+            # 0x1000 is PROCESS_QUERY_LIMITED_INFORMATION
+            handle = kernel32.OpenProcess(0x1000, False, pid)
+            if not handle:
+                return False
+            exitCode = ctypes.c_ulong()
+            try:
+                kernel32.GetExitCodeProcess(handle, ctypes.byref(exitCode))
+            finally:
+                kernel32.CloseHandle(handle)
+            return exitCode.value == 259  # STILL_ACTIVE
+        except (ImportError, AttributeError, OSError):
+            return True
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # e.g. a process of another user
+        return True
+    return True
+
+
+def tombstoneNames(path):
+    """
+    Function to get the names of the tombstones and staging directories left
+    for a directory.
+
+    Staging directories of installations still running concurrently are
+    skipped. Their process ID is part of the name.
+
+    @param path name of the directory
+    @type str
+    @return list of tombstone names
+    @rtype list of str
+    """
+    dirName, baseName = os.path.split(os.path.normpath(path))
+    names = glob.glob(
+        os.path.join(glob.escape(dirName), ".{0}.tombstone-*".format(baseName))
+    )
+    prefix = ".{0}.staging-".format(baseName)
+    for name in glob.glob(
+        os.path.join(glob.escape(dirName), glob.escape(prefix) + "*")
+    ):
+        try:
+            pid = int(os.path.basename(name)[len(prefix) :].split("-", 1)[0])
+        except ValueError:
+            continue
+        if not isProcessRunning(pid):
+            names.append(name)
+    return names
+
+
+def removeTombstones(tombstones):
+    """
+    Delete the given tombstones in a background thread.
+
+    @param tombstones list of tombstone names
+    @type list of str
+    """
+    global tombstoneThreads
+
+    if tombstones:
+        thread = threading.Thread(
+            target=lambda: [shutil.rmtree(t, True) for t in tombstones],
+            name="TombstoneRemover",
+        )
+        thread.start()
+        tombstoneThreads.append(thread)
+
+
+def buryDirectory(path):
+    """
+    Rename a directory to a tombstone and delete that in a background
+    thread.
+
+    Renaming the directory is atomic and takes the old tree out of the way
+    immediately. Tombstones left by an interrupted run are removed by the
+    next one.
+
+    @param path name of the directory
+    @type str
+    """
+    path = os.path.normpath(path)
+    if not os.path.isdir(path) or os.path.islink(path):
+        return
+
+    tombstone = siblingName(path, "tombstone")
+    try:
+        os.rename(path, tombstone)
+    except OSError:
+        # renaming is not possible, e.g. for a mount point
+        shutil.rmtree(path, True)
+    else:
+        removeTombstones([tombstone])
+
+
+def waitForTombstones():
+    """
+    Wait for the deletion of the tombstones to be finished.
+    """
+    global tombstoneThreads
+
+    for thread in tombstoneThreads:
+        thread.join()
+    tombstoneThreads = []
+
+
+def journalName(path):
+    """
+    Function to get the name of the journal of a staged installation.
+
+    @param path name of the eric directory
+    @type str
+    @return name of the journal file
+    @rtype str
+    """
+    dirName, baseName = os.path.split(os.path.normpath(path))
+    return os.path.join(dirName, ".{0}.journal".format(baseName))
+
+
+def startStaging(ericDir):
+    """
+    Prepare a staged installation of the given eric directory.
+
+    The staging directory is placed next to the eric directory in order to
+    be on the same file system.
+
+    @param ericDir name of the eric directory
+    @type str
+    """
+    global stagingDir, stagedEricDir
+
+    stagedEricDir = os.path.normpath(ericDir)
+    stagingDir = siblingName(stagedEricDir, "staging")
+
+
+def stagedPath(path):
+    """
+    Function to get the name a file or directory of the eric directory has
+    in the staging directory.
+
+    @param path name of the file or directory
+    @type str
+    @return name within the staging directory (unchanged, if not staging or
+        the path is outside the eric directory)
+    @rtype str
+    """
+    global stagingDir, stagedEricDir
+
+    if stagingDir and (
+        path == stagedEricDir or path.startswith(stagedEricDir + os.sep)
+    ):
+        return stagingDir + path[len(stagedEricDir) :]
+    return path
+
+
+def stagedFile(path):
+    """
+    Function to get the name a file outside of the eric directory is written
+    to by a staged installation.
+
+    Such files (e.g. the config file and the wrappers) are written next to
+    the live ones and renamed into place together with the swap of the eric
+    directory.
+
+    @param path name of the file
+    @type str
+    @return name of the staged file (unchanged, if not staging or the path
+        is within the staging directory)
+    @rtype str
+    """
+    global stagingDir, stagedFiles
+
+    if not stagingDir or path == stagingDir or path.startswith(stagingDir + os.sep):
+        return path
+
+    for staged, live in stagedFiles.items():
+        if live == path:
+            return staged
+    staged = siblingName(path, "staged")
+    stagedFiles[staged] = path
+    return staged
+
+
+def discardStaging():
+    """
+    Remove the staging directory and the staged files of a failed staged
+    installation.
+    """
+    global stagingDir, stagedFiles
+
+    if stagingDir:
+        if os.path.isdir(stagingDir):
+            print("Removing the incomplete installation.")
+            removeTombstones([stagingDir])
+        stagingDir = ""
+    for staged in stagedFiles:
+        with contextlib.suppress(OSError):
+            os.remove(staged)
+    stagedFiles = {}
+
+
+def swapStagedInstall():
+    """
+    Swap the staged eric directory into place.
+
+    The old directory is renamed to a tombstone and the staging directory
+    to the eric directory. Afterwards the staged files outside of it are
+    renamed to their final names. A journal written beforehand allows a later
+    run to complete or roll back an interrupted swap.
+
+    @return result code
+    @rtype int
+    """
+    global stagingDir, stagedEricDir, stagedFiles
+
+    journal = journalName(stagedEricDir)
+    backup = siblingName(stagedEricDir, "tombstone")
+    try:
+        with open(journal, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "live": stagedEricDir,
+                    "staging": stagingDir,
+                    "backup": backup,
+                    "files": stagedFiles,
+                },
+                f,
+            )
+            f.flush()
+            os.fsync(f.fileno())
+
+        if os.path.isdir(stagedEricDir):
+            os.rename(stagedEricDir, backup)
+        os.rename(stagingDir, stagedEricDir)
+        stagingDir = ""
+        for staged, live in stagedFiles.items():
+            os.replace(staged, live)
+        stagedFiles = {}
+        os.remove(journal)
+    except OSError as msg:
+        sys.stderr.write(
+            "Error: {0}\nCould not activate the installation.\n".format(msg)
+        )
+        if not stagingDir:
+            # the eric directory was swapped already, leave the staged files
+            # to be renamed by the recovery of the next run
+            stagedFiles = {}
+        else:
+            # put the old installation back into place
+            with contextlib.suppress(OSError):
+                if not os.path.isdir(stagedEricDir) and os.path.isdir(backup):
+                    os.rename(backup, stagedEricDir)
+                os.remove(journal)
+        return 7
+
+    if os.path.isdir(backup):
+        removeTombstones([backup])
+    return 0
+
+
+def recoverStagedInstall(ericDir):
+    """
+    Complete or roll back an interrupted swap of a staged installation.
+
+    A swap is completed, if the staging directory is still present or was
+    renamed already, and rolled back otherwise. The staged files outside of
+    the eric directory are renamed into place or removed accordingly.
+
+    @param ericDir name of the eric directory
+    @type str
+    """
+    journal = journalName(ericDir)
+    try:
+        with open(journal, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+        live, staging, backup = entries["live"], entries["staging"], entries["backup"]
+        files = dict(entries.get("files", {}))
+    except FileNotFoundError:
+        return
+    except (OSError, ValueError, KeyError, TypeError):
+        # the journal was not written completely, i.e. the swap didn't start
+        with contextlib.suppress(OSError):
+            os.remove(journal)
+        return
+
+    try:
+        completed = not os.path.isdir(staging)
+        if not os.path.isdir(live):
+            if os.path.isdir(staging):
+                os.rename(staging, live)
+                completed = True
+                print("Completed the interrupted installation in '{0}'.".format(live))
+            elif os.path.isdir(backup):
+                os.rename(backup, live)
+                completed = False
+                print("Rolled back the interrupted installation in '{0}'.".format(live))
+        for staged, liveFile in files.items():
+            if os.path.lexists(staged):
+                if completed:
+                    os.replace(staged, liveFile)
+                else:
+                    os.remove(staged)
+        removeTombstones([d for d in (staging, backup) if os.path.isdir(d)])
+        os.remove(journal)
+    except OSError as msg:
+        sys.stderr.write(
+            "Error: {0}\nCould not recover the interrupted installation.\n".format(msg)
+        )
+        exit(7)
+
+
+def createGlobalPluginsDir():
+    """
+    Create the global plugins directory, if it doesn't exist.
+    """
+    global cfg, distDir, installArchive
+
+    pdir = os.path.join(cfg["mdir"], "eric7plugins")
+    fname = os.path.join(pdir, "__init__.py")
+    text = '''# -*- coding: utf-8 -*-
 
 """
 Package containing the global plugins.
 """
 '''
-            )
+    if installArchive is not None:
+        # the plug-ins directory is not part of the installation
+        writeArchiveEntry(fname, text.encode("utf-8"), 0o644, record=False)
+    elif not os.path.exists(fname):
+        if not os.path.exists(pdir):
+            os.mkdir(pdir, 0o755)
+        with open(fname, "w") as f:
+            f.write(text)
         os.chmod(fname, 0o644)
+        countWrittenFile(os.path.getsize(fname))
+
+
+def removeStaleUiFiles(dirName, fileNames):
+    """
+    Delete all Ui_*.py files of a directory without a corresponding *.ui
+    file.
+
+    @param dirName name of the directory
+    @type str
+    @param fileNames list of file names contained in the directory
+    @type list of str
+    """
+    for formName, sourceName in [
+        (f.replace("Ui_", "").replace(".py", ".ui"), f)
+        for f in fileNames
+        if fnmatch.fnmatch(f, "Ui_*.py")
+    ]:
+        if not sourceExists(os.path.join(dirName, formName)):
+            removeSourceFile(os.path.join(dirName, sourceName))
+            if sourceExists(os.path.join(dirName, sourceName + "c")):
+                removeSourceFile(os.path.join(dirName, sourceName + "c"))
 
 
 def cleanupSource(dirName):
@@ -457,16 +2909,7 @@ def cleanupSource(dirName):
     """
     # step 1: delete all Ui_*.py files without a corresponding
     #         *.ui file
-    dirListing = os.listdir(dirName)
-    for formName, sourceName in [
-        (f.replace("Ui_", "").replace(".py", ".ui"), f)
-        for f in dirListing
-        if fnmatch.fnmatch(f, "Ui_*.py")
-    ]:
-        if not os.path.exists(os.path.join(dirName, formName)):
-            os.remove(os.path.join(dirName, sourceName))
-            if os.path.exists(os.path.join(dirName, sourceName + "c")):
-                os.remove(os.path.join(dirName, sourceName + "c"))
+    removeStaleUiFiles(dirName, os.listdir(dirName))
 
     # step 2: delete the __pycache__ directory and all remaining *.pyc files
     if os.path.exists(os.path.join(dirName, "__pycache__")):
@@ -722,14 +3165,327 @@ def shutilCopy(src, dst, perm=0o644):
     """
     Wrapper function around shutil.copy() to ensure the permissions.
 
+    The file is created according to the selected copy strategy or written
+    to the archive.
+
     @param src source file name (string)
     @param dst destination file name or directory name (string)
     @param perm permissions to be set (integer)
     """
-    shutil.copy(src, dst)
-    if os.path.isdir(dst):
-        dst = os.path.join(dst, os.path.basename(src))
-    os.chmod(dst, perm)
+    if dst in knownDirs or os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    dst = stagedFile(dst)
+    if installArchive is not None:
+        archiveFile(src, dst, perm)
+        return
+    if isArchiveSource(src):
+        extractSourceFile(src, dst, perm)
+    elif not cloneFile(src, dst, perm):
+        unlinkSameFile(src, dst)
+        shutil.copy(src, dst)
+        os.chmod(dst, perm)
+    recordInstalledFile(dst)
+
+
+def ericFilterSets(withAssets=True):
+    """
+    Function to define the parts of the eric source tree to be installed.
+
+    @param withAssets flag indicating to include the static assets
+    @type bool
+    @return list of tuples containing the source directory, the destination
+        directory, a list of filter patterns determining the files to be
+        copied and a list of filter patterns determining the files to be
+        skipped
+    @rtype list of tuple of (str, str, list of str, list of str)
+    """
+    global cfg, eric7SourceDir
+
+    return [
+        (
+            eric7SourceDir,
+            cfg["ericDir"],
+            ["*.py", "*.pyc", "*.pyo", "*.pyw"],
+            ["eric7config.py*"],
+        ),
+    ] + (assetFilterSets() if withAssets else [])
+
+
+def assetFilterSets():
+    """
+    Function to define the parts of the eric source tree containing static
+    assets, i.e. files not generated during the installation.
+
+    @return list of tuples containing the source directory, the destination
+        directory, a list of filter patterns determining the files to be
+        copied and a list of filter patterns determining the files to be
+        skipped
+    @rtype list of tuple of (str, str, list of str, list of str)
+    """
+    global cfg, eric7SourceDir
+
+    return [
+        (
+            os.path.join(eric7SourceDir, "Plugins"),
+            os.path.join(cfg["ericDir"], "Plugins"),
+            ["*.svgz", "*.svg", "*.png", "*.style", "*.tmpl", "*.txt"],
+            [],
+        ),
+        (
+            os.path.join(eric7SourceDir, "Documentation"),
+            cfg["ericDocDir"],
+            ["*.html", "*.qch"],
+            [],
+        ),
+        (os.path.join(eric7SourceDir, "CSSs"), cfg["ericCSSDir"], ["*.css"], []),
+        (
+            os.path.join(eric7SourceDir, "Styles"),
+            cfg["ericStylesDir"],
+            ["*.qss", "*.ehj"],
+            [],
+        ),
+        (os.path.join(eric7SourceDir, "Themes"), cfg["ericThemesDir"], ["*.ethj"], []),
+        (
+            os.path.join(eric7SourceDir, "i18n"),
+            cfg["ericTranslationsDir"],
+            ["*.qm"],
+            [],
+        ),
+        (
+            os.path.join(eric7SourceDir, "icons"),
+            cfg["ericIconDir"],
+            ["*.svgz", "*.svg", "*.png", "LICENSE*.*", "readme.txt"],
+            [],
+        ),
+        (
+            os.path.join(eric7SourceDir, "pixmaps"),
+            cfg["ericPixDir"],
+            ["*.svgz", "*.svg", "*.png", "*.xpm", "*.ico", "*.gif"],
+            [],
+        ),
+        (
+            os.path.join(eric7SourceDir, "DesignerTemplates"),
+            cfg["ericTemplatesDir"],
+            ["*.tmpl"],
+            [],
+        ),
+        (
+            os.path.join(eric7SourceDir, "CodeTemplates"),
+            cfg["ericCodeTemplatesDir"],
+            ["*.tmpl"],
+            [],
+        ),
+        (
+            os.path.join(eric7SourceDir, "DebugClients", "Python", "coverage"),
+            os.path.join(cfg["ericDir"], "DebugClients", "Python", "coverage"),
+            ["*.js", "*.html", "*.png", "*.css", "*.scss", "*.txt", "*.rst"],
+            [],
+        ),
+        # some data files needed at various places
+        (
+            os.path.join(eric7SourceDir, "data"),
+            os.path.join(cfg["ericDir"], "data"),
+            ["*.txt"],
+            [],
+        ),
+        (
+            os.path.join(eric7SourceDir, "EricNetwork", "data"),
+            os.path.join(cfg["ericDir"], "EricNetwork", "data"),
+            ["*.dat", "*.txt"],
+            [],
+        ),
+        (
+            os.path.join(eric7SourceDir, "IconEditor", "cursors"),
+            os.path.join(cfg["ericDir"], "IconEditor", "cursors"),
+            ["*.xpm"],
+            [],
+        ),
+        (
+            os.path.join(eric7SourceDir, "UI", "data"),
+            os.path.join(cfg["ericDir"], "UI", "data"),
+            ["*.css"],
+            [],
+        ),
+        (
+            os.path.join(eric7SourceDir, "WebBrowser"),
+            os.path.join(cfg["ericDir"], "WebBrowser"),
+            ["*.xbel", "*.xml", "*.html", "*.png", "*.gif", "*.js"],
+            [],
+        ),
+    ]
+
+
+def splitZipBundle(copyList):
+    """
+    Function to separate the modules to be bundled from the files to be
+    installed.
+
+    The bundle gets the sources and one byte code file per module placed
+    where zipimport looks for it. Modules, that are run as scripts or found
+    by their file names, are installed as files as well.
+
+    @param copyList list of tuples containing the source file name, the
+        destination file name and the permissions to be set
+    @type list of tuple of (str, str, int)
+    @return tuple containing a list of tuples with the source file name and
+        the name within the bundle and the list of files to be installed
+    @rtype tuple of (list of tuple of (str, str), list of tuple of (str, str, int))
+    """
+    global cfg, optimizationLevels
+
+    ericDir = os.path.normpath(cfg["ericDir"])
+    # the names within the bundle are derived from the final location, not
+    # from the one of a staged installation
+    liveBaseDir = os.path.dirname(installedPath(ericDir))
+    cacheSuffix = os.path.basename(
+        importlib.util.cache_from_source(
+            "x.py", optimization=optimizationLevels[0] or ""
+        )
+    )[1:]
+
+    bundleList = []
+    installList = []
+    for src, dst, perm in copyList:
+        if not src.endswith((".py", ".pyc")) or not dst.startswith(ericDir + os.sep):
+            installList.append((src, dst, perm))
+            continue
+
+        directory, name = os.path.split(src)
+        arcDir = os.path.relpath(os.path.dirname(installedPath(dst)), liveBaseDir)
+        if os.path.basename(directory) == "__pycache__":
+            module = name.split(".", 1)[0]
+            moduleSource = os.path.join(os.path.dirname(directory), module + ".py")
+            arcName = os.path.join(os.path.dirname(arcDir), module + ".pyc")
+            if name[len(module) :] != cacheSuffix:
+                # other optimization levels are not used by zipimport
+                arcName = ""
+        else:
+            moduleSource = src[:-1] if src.endswith(".pyc") else src
+            arcName = os.path.join(arcDir, name)
+
+        if arcName:
+            arcName = arcName.replace(os.sep, "/")
+            if not arcName.startswith("eric7/"):
+                sys.stderr.write(
+                    "Error: The module '{0}' cannot be bundled as it is not part"
+                    " of the eric7 package.\n".format(arcName)
+                )
+                exit(7)
+            bundleList.append((src, arcName))
+        if keepsSource(moduleSource):
+            installList.append((src, dst, perm))
+    return bundleList, installList
+
+
+def writeZipBundle(bundleList):
+    """
+    Write the bundle of the eric modules.
+
+    The entries get the modification times of their sources, which zipimport
+    compares with the ones recorded in timestamp based byte code files.
+
+    @param bundleList list of tuples containing the source file name and the
+        name within the bundle
+    @type list of tuple of (str, str)
+    """
+    global cfg, installArchive, zipBundleName
+
+    bundleName = os.path.join(cfg["ericDir"], zipBundleName)
+    target = io.BytesIO() if installArchive is not None else bundleName
+    with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as bundle:
+        for src, arcName in sorted(bundleList, key=lambda entry: entry[1]):
+            # zip files can't store times before 1980
+            mtime = max(sourceStat(src)[2] // 1000000000, 315619200)
+            info = zipfile.ZipInfo(arcName, date_time=time.localtime(mtime)[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            bundle.writestr(info, readSourceFile(src))
+
+    if installArchive is not None:
+        writeArchiveEntry(bundleName, target.getvalue(), 0o644)
+    else:
+        os.chmod(bundleName, 0o644)
+        recordInstalledFile(bundleName)
+
+
+def writeModuleIndex(copyList):
+    """
+    Write the index of the installed eric modules.
+
+    The index maps the module names to the files relative to the directory
+    containing the eric package and flags the packages. It is used by the
+    meta path finder of eric7config.
+
+    @param copyList list of tuples containing the source file name, the
+        destination file name and the permissions to be set
+    @type list of tuple of (str, str, int)
+    """
+    global cfg, installArchive, moduleIndexName
+
+    ericDir = os.path.normpath(cfg["ericDir"])
+    # the index refers to the final location, not to the one of a staged
+    # installation
+    liveBaseDir = os.path.dirname(installedPath(ericDir))
+    modulesCount = 0
+    index = {}
+    for _src, dst, _perm in copyList:
+        if (
+            not dst.endswith((".py", ".pyc"))
+            or not dst.startswith(ericDir + os.sep)
+            or os.path.basename(os.path.dirname(dst)) == "__pycache__"
+        ):
+            continue
+
+        modulesCount += 1
+        relPath = os.path.relpath(installedPath(dst), liveBaseDir)
+        parts = os.path.splitext(relPath)[0].split(os.sep)
+        isPackage = parts[-1] == "__init__"
+        if isPackage:
+            del parts[-1]
+        if all(part.isidentifier() for part in parts):
+            index[".".join(parts)] = [relPath, isPackage]
+    if modulesCount and not index:
+        sys.stderr.write(
+            "Error: None of the {0} modules could be added to the module"
+            " index.\n".format(modulesCount)
+        )
+        exit(7)
+
+    data = json.dumps(index, indent=0, sort_keys=True).encode("utf-8")
+    indexName = os.path.join(cfg["ericDir"], moduleIndexName)
+    if installArchive is not None:
+        writeArchiveEntry(indexName, data, 0o644)
+    else:
+        with open(indexName, "wb") as indexFile:
+            indexFile.write(data)
+        os.chmod(indexName, 0o644)
+        recordInstalledFile(indexName)
+
+
+def installAssets():
+    """
+    Install the static assets of eric.
+
+    The assets don't depend on the generated forms and the compiled sources,
+    so they may be installed while these are being created.
+    """
+    global previousManifest, assetsInstalled
+
+    filterSets = [
+        (src, actualPath(dst), filters, excludePatterns)
+        for src, dst, filters, excludePatterns in assetFilterSets()
+    ]
+    try:
+        copyList = createInstallPlan(filterSets)
+        if previousManifest:
+            filesCount = len(copyList)
+            copyList = changedFiles(copyList, previousManifest)
+            print("Updating {0} of {1} asset files.".format(len(copyList), filesCount))
+        copyFiles(copyList)
+    except OSError as msg:
+        sys.stderr.write("Error: {0}\nTry install with admin rights.\n".format(msg))
+        exit(7)
+    assetsInstalled = True
 
 
 def installEric():
@@ -738,8 +3494,7 @@ def installEric():
 
     @return result code (integer)
     """
-    global distDir, doCleanup, cfg, progLanguages, sourceDir, configName
-    global installApis
+    global distDir, cfg, stagedInstall, installArchive
 
     # Create the platform specific wrappers.
     scriptsDir = "install_scripts"
@@ -778,12 +3533,62 @@ def installEric():
         for key in list(cfg.keys()):
             cfg[key] = os.path.normpath(os.path.join(distDir, cfg[key].lstrip(os.sep)))
 
+    # redirect the eric directory to the staging directory
+    liveConfig = dict(cfg)
+    if stagedInstall:
+        startStaging(cfg["ericDir"])
+        for key in cfg:
+            cfg[key] = stagedPath(cfg[key])
+
+    try:
+        res = installEricFiles(wnames, scriptsDir)
+    finally:
+        # the platform specific entries and the callers refer to the final
+        # locations
+        cfg.update(liveConfig)
+    if res != 0:
+        return res
+
+    with installPhase("platform specifics"):
+        # Create menu entry for Linux systems
+        if sys.platform.startswith("linux"):
+            createLinuxSpecifics()
+
+        elif installArchive is not None:
+            print("Desktop entries are not created for an archive.")
+
+        # Create Desktop and Start Menu entries for Windows systems
+        elif sys.platform.startswith(("win", "cygwin")):
+            createWindowsLinks()
+
+        # Create a Mac application bundle
+        elif sys.platform == "darwin":
+            createMacAppBundle(cfg["ericDir"])
+
+    return 0
+
+
+def installEricFiles(wnames, scriptsDir):
+    """
+    Install the files of eric into the directories of the configuration.
+
+    @param wnames list of the names of the created wrappers
+    @type list of str
+    @param scriptsDir name of the directory containing the wrappers
+    @type str
+    @return result code
+    @rtype int
+    """
+    global distDir, cfg, progLanguages, sourceDir, configName, installApis
+    global previousManifest, installArchive, assetsInstalled, zipBundle
+    global moduleIndex
+
     try:
         # Install the files
         # make the install directories
         for key in cfg:
-            if cfg[key] and not os.path.isdir(cfg[key]):
-                os.makedirs(cfg[key])
+            if cfg[key]:
+                makeDirs(cfg[key])
 
         # copy the eric config file
         if distDir:
@@ -795,87 +3600,23 @@ def installEric():
             if os.path.exists(configName + "c"):
                 shutilCopy(configName + "c", modDir)
 
-        # copy the various parts of eric
-        copyTree(
-            eric7SourceDir,
-            cfg["ericDir"],
-            ["*.py", "*.pyc", "*.pyo", "*.pyw"],
-            excludePatterns=["eric7config.py*"],
-        )
-        copyTree(
-            os.path.join(eric7SourceDir, "Plugins"),
-            os.path.join(cfg["ericDir"], "Plugins"),
-            ["*.svgz", "*.svg", "*.png", "*.style", "*.tmpl", "*.txt"],
-        )
-        copyTree(
-            os.path.join(eric7SourceDir, "Documentation"),
-            cfg["ericDocDir"],
-            ["*.html", "*.qch"],
-        )
-        copyTree(os.path.join(eric7SourceDir, "CSSs"), cfg["ericCSSDir"], ["*.css"])
-        copyTree(
-            os.path.join(eric7SourceDir, "Styles"),
-            cfg["ericStylesDir"],
-            ["*.qss", "*.ehj"],
-        )
-        copyTree(
-            os.path.join(eric7SourceDir, "Themes"), cfg["ericThemesDir"], ["*.ethj"]
-        )
-        copyTree(
-            os.path.join(eric7SourceDir, "i18n"), cfg["ericTranslationsDir"], ["*.qm"]
-        )
-        copyTree(
-            os.path.join(eric7SourceDir, "icons"),
-            cfg["ericIconDir"],
-            ["*.svgz", "*.svg", "*.png", "LICENSE*.*", "readme.txt"],
-        )
-        copyTree(
-            os.path.join(eric7SourceDir, "pixmaps"),
-            cfg["ericPixDir"],
-            ["*.svgz", "*.svg", "*.png", "*.xpm", "*.ico", "*.gif"],
-        )
-        copyTree(
-            os.path.join(eric7SourceDir, "DesignerTemplates"),
-            cfg["ericTemplatesDir"],
-            ["*.tmpl"],
-        )
-        copyTree(
-            os.path.join(eric7SourceDir, "CodeTemplates"),
-            cfg["ericCodeTemplatesDir"],
-            ["*.tmpl"],
-        )
-        copyTree(
-            os.path.join(eric7SourceDir, "DebugClients", "Python", "coverage"),
-            os.path.join(cfg["ericDir"], "DebugClients", "Python", "coverage"),
-            ["*.js", "*.html", "*.png", "*.css", "*.scss", "*.txt", "*.rst"],
-        )
-
-        # copy some data files needed at various places
-        copyTree(
-            os.path.join(eric7SourceDir, "data"),
-            os.path.join(cfg["ericDir"], "data"),
-            ["*.txt"],
-        )
-        copyTree(
-            os.path.join(eric7SourceDir, "EricNetwork", "data"),
-            os.path.join(cfg["ericDir"], "EricNetwork", "data"),
-            ["*.dat", "*.txt"],
-        )
-        copyTree(
-            os.path.join(eric7SourceDir, "IconEditor", "cursors"),
-            os.path.join(cfg["ericDir"], "IconEditor", "cursors"),
-            ["*.xpm"],
-        )
-        copyTree(
-            os.path.join(eric7SourceDir, "UI", "data"),
-            os.path.join(cfg["ericDir"], "UI", "data"),
-            ["*.css"],
-        )
-        copyTree(
-            os.path.join(eric7SourceDir, "WebBrowser"),
-            os.path.join(cfg["ericDir"], "WebBrowser"),
-            ["*.xbel", "*.xml", "*.html", "*.png", "*.gif", "*.js"],
+        # copy the various parts of eric, the static assets may have been
+        # installed already
+        copyList = byteCodeOnly(
+            createInstallPlan(ericFilterSets(withAssets=not assetsInstalled))
         )
+        if zipBundle:
+            bundleList, copyList = splitZipBundle(copyList)
+        if moduleIndex:
+            writeModuleIndex(copyList)
+        if previousManifest:
+            filesCount = len(copyList)
+            copyList = changedFiles(copyList, previousManifest)
+            print("Updating {0} of {1} files.".format(len(copyList), filesCount))
+        copyFiles(copyList)
+        traceCopySubtrees(ericFilterSets())
+        if zipBundle:
+            writeZipBundle(bundleList)
 
         # copy the wrappers
         for wname in wnames:
@@ -901,7 +3642,7 @@ def installEric():
             print(
                 "Could not install '{0}'.".format(os.path.join(sourceDir, "docs", name))
             )
-    for name in glob.glob(os.path.join(sourceDir, "docs", "README*.*")):
+    for name in globSource(os.path.join(sourceDir, "docs", "README*.*")):
         try:
             shutilCopy(name, cfg["ericDocDir"])
         except OSError:
@@ -920,17 +3661,16 @@ def installEric():
 
     # install the API file
     if installApis:
-        if os.access(cfg["apidir"], os.W_OK):
+        if installArchive is not None or os.access(cfg["apidir"], os.W_OK):
             for progLanguage in progLanguages:
                 apidir = os.path.join(cfg["apidir"], progLanguage)
                 print("Installing {0} API files to '{1}'.".format(progLanguage, apidir))
-                if not os.path.exists(apidir):
-                    os.makedirs(apidir)
-                for apiName in glob.glob(
+                makeDirs(apidir)
+                for apiName in globSource(
                     os.path.join(eric7SourceDir, "APIs", progLanguage, "*.api")
                 ):
                     shutilCopy(apiName, apidir)
-                for apiName in glob.glob(
+                for apiName in globSource(
                     os.path.join(eric7SourceDir, "APIs", progLanguage, "*.bas")
                 ):
                     shutilCopy(apiName, apidir)
@@ -938,18 +3678,6 @@ def installEric():
             print("The API directory '{0}' is not writable.".format(cfg["apidir"]))
             print("Use the API files provided by the 'API Files' plug-in.")
 
-    # Create menu entry for Linux systems
-    if sys.platform.startswith("linux"):
-        createLinuxSpecifics()
-
-    # Create Desktop and Start Menu entries for Windows systems
-    elif sys.platform.startswith(("win", "cygwin")):
-        createWindowsLinks()
-
-    # Create a Mac application bundle
-    elif sys.platform == "darwin":
-        createMacAppBundle(cfg["ericDir"])
-
     return 0
 
 
@@ -963,8 +3691,7 @@ def createLinuxSpecifics():
 
     if distDir:
         dst = os.path.normpath(os.path.join(distDir, "usr/share/icons"))
-        if not os.path.exists(dst):
-            os.makedirs(dst)
+        makeDirs(dst)
         shutilCopy(
             os.path.join(eric7SourceDir, "pixmaps", "eric_icon.png"),
             os.path.join(dst, "eric.png"),
@@ -977,8 +3704,7 @@ def createLinuxSpecifics():
         dst = os.path.normpath(
             os.path.join(distDir, "usr/share/icons/hicolor/48x48/apps")
         )
-        if not os.path.exists(dst):
-            os.makedirs(dst)
+        makeDirs(dst)
         shutilCopy(
             os.path.join(eric7SourceDir, "pixmaps", "eric48_icon.png"),
             os.path.join(dst, "eric.png"),
@@ -989,8 +3715,7 @@ def createLinuxSpecifics():
         )
 
         dst = os.path.normpath(os.path.join(distDir, "usr/share/applications"))
-        if not os.path.exists(dst):
-            os.makedirs(dst)
+        makeDirs(dst)
         copyDesktopFile(
             os.path.join(dataSourceDir, "eric7.desktop.in"),
             os.path.join(dst, "eric7.desktop"),
@@ -1001,8 +3726,7 @@ def createLinuxSpecifics():
         )
 
         dst = os.path.normpath(os.path.join(distDir, "usr/share/metainfo"))
-        if not os.path.exists(dst):
-            os.makedirs(dst)
+        makeDirs(dst)
         copyAppStreamFile(
             os.path.join(dataSourceDir, "eric7.appdata.xml.in"),
             os.path.join(dst, "eric7.appdata.xml"),
@@ -1056,8 +3780,7 @@ def createLinuxSpecifics():
                 "appdata",
             )
         ]:
-            if not os.path.isdir(directory):
-                os.makedirs(directory)
+            makeDirs(directory)
         # now copy the files
         shutilCopy(
             os.path.join(eric7SourceDir, "pixmaps", "eric_icon.png"),
@@ -1113,7 +3836,7 @@ def createWindowsLinks():
                 sys.executable,
                 os.path.join(os.path.dirname(__file__), "create_windows_links.py"),
             ]
-            subprocess.run(args)  # secok
+            runProcess(args)  # secok
         else:
             print(
                 "\nThe Python package 'pywin32' is not installed. Desktop and"
@@ -1143,7 +3866,7 @@ def createWindowsLinks():
         eric7EntryPath = os.path.join(programsFolder, windowsProgramsEntry())
         if not os.path.exists(eric7EntryPath):
             try:
-                os.makedirs(eric7EntryPath)
+                makeDirs(eric7EntryPath)
             except OSError:
                 # maybe restrictions prohibited link creation
                 return
@@ -1162,6 +3885,7 @@ def createMacAppBundle(pydir):
     @type str
     """
     global cfg, macAppBundleName, macPythonExe, macAppBundlePath
+    global zipBundle, zipBundleName
 
     directories = {
         "contents": "{0}/{1}/Contents/".format(macAppBundlePath, macAppBundleName),
@@ -1169,12 +3893,12 @@ def createMacAppBundle(pydir):
         "icns": "{0}/{1}/Contents/Resources".format(macAppBundlePath, macAppBundleName),
     }
     for directory in directories.values():
-        if not os.path.exists(directory):
-            os.makedirs(directory)
+        makeDirs(directory)
 
     if macPythonExe == defaultMacPythonExe and macPythonExe:
         starter = os.path.join(directories["exe"], "eric")
         os.symlink(macPythonExe, starter)
+        recordInstalledFile(starter)
     else:
         starter = "python{0}".format(sys.version_info.major)
 
@@ -1203,18 +3927,29 @@ def createMacAppBundle(pydir):
                 pathlist_n.append(path_)
         pathLine = "PATH={0}\n".format(os.pathsep.join(pathlist_n))
 
+    # determine entry for PYTHONPATH
+    bundleLine = (
+        """export PYTHONPATH="{0}${{PYTHONPATH:+:$PYTHONPATH}}"\n""".format(
+            os.path.join(pydir, zipBundleName)
+        )
+        if zipBundle
+        else ""
+    )
+
     # create the wrapper script
     wrapper = (
         """#!/bin/sh\n"""
         """\n"""
         """{0}"""
         """{1}"""
+        """{5}"""
         """exec "{2}" "{3}/{4}.py" "$@"\n""".format(
-            pathLine, dyldLine, starter, pydir, "eric7"
+            pathLine, dyldLine, starter, pydir, "eric7", bundleLine
         )
     )
     copyToFile(wname, wrapper)
     os.chmod(wname, 0o755)  # secok
+    recordInstalledFile(wname)
 
     shutilCopy(
         os.path.join(eric7SourceDir, "pixmaps", "eric_2.icns"),
@@ -1276,6 +4011,7 @@ def createMacAppBundle(pydir):
             CopyrightShort,
         ),
     )
+    recordInstalledFile(os.path.join(directories["contents"], "Info.plist"))
 
 
 def createInstallConfig():
@@ -1313,18 +4049,84 @@ def createInstallConfig():
 
 configLength = 16
 
+# the meta path finder added to the config file for a module index
+moduleIndexFinder = (
+    """\n"""
+    """\n"""
+    """class _ModuleIndexFinder:\n"""
+    """    '''\n"""
+    """    Class implementing a meta path finder looking up the eric modules\n"""
+    """    in the module index written by the installer.\n"""
+    """    '''\n"""
+    """\n"""
+    """    def __init__(self, indexFile):\n"""
+    """        '''\n"""
+    """        Constructor\n"""
+    """\n"""
+    """        @param indexFile name of the module index file\n"""
+    """        @type str\n"""
+    """        '''\n"""
+    """        import json\n"""
+    """        import os\n"""
+    """\n"""
+    """        with open(indexFile, 'r', encoding='utf-8') as f:\n"""
+    """            self.__index = json.load(f)\n"""
+    """        self.__baseDir = os.path.dirname(_pkg_config['ericDir'])\n"""
+    """\n"""
+    """    def find_spec(self, fullname, path=None, target=None):\n"""
+    """        '''\n"""
+    """        Public method to find the spec of an indexed module.\n"""
+    """\n"""
+    """        @param fullname name of the module\n"""
+    """        @type str\n"""
+    """        @param path search path of the parent package\n"""
+    """        @type list of str\n"""
+    """        @param target module object being reloaded\n"""
+    """        @type module\n"""
+    """        @return spec of the module or None, if it is not indexed\n"""
+    """        @rtype importlib.machinery.ModuleSpec\n"""
+    """        '''\n"""
+    """        try:\n"""
+    """            fileName, isPackage = self.__index[fullname]\n"""
+    """        except KeyError:\n"""
+    """            return None\n"""
+    """\n"""
+    """        import importlib.util\n"""
+    """        import os\n"""
+    """\n"""
+    """        fileName = os.path.join(self.__baseDir, fileName)\n"""
+    """        return importlib.util.spec_from_file_location(\n"""
+    """            fullname,\n"""
+    """            fileName,\n"""
+    """            submodule_search_locations=(\n"""
+    """                [os.path.dirname(fileName)] if isPackage else None\n"""
+    """            ),\n"""
+    """        )\n"""
+    """\n"""
+    """\n"""
+    """try:\n"""
+    """    import sys\n"""
+    """\n"""
+    """    sys.meta_path.insert(\n"""
+    """        0, _ModuleIndexFinder(_pkg_config['ericModuleIndex'])\n"""
+    """    )\n"""
+    """except (OSError, ValueError):\n"""
+    """    # fall back to searching the module search path\n"""
+    """    pass\n"""
+)
+
 
 def createConfig():
     """
     Create a config file with the respective config entries.
     """
-    global cfg, macAppBundlePath, configName
+    global cfg, macAppBundlePath, configName, moduleIndex, moduleIndexName
 
     apis = []
     if installApis:
         for progLanguage in progLanguages:
             for apiName in sorted(
-                glob.glob(os.path.join(eric7SourceDir, "APIs", progLanguage, "*.api"))
+                globSource(os.path.join(eric7SourceDir, "APIs", progLanguage, "*.api"))
             ):
                 apis.append(os.path.basename(apiName))
 
@@ -1361,7 +4163,8 @@ def createConfig():
         """    'mdir': r'{14}',\n"""
         """    'apidir': r'{15}',\n"""
         """    'apis': {16},\n"""
-        """{17}"""
+        """    'ericModuleIndex': r'{17}',\n"""
+        """{18}"""
         """}}\n"""
         """\n"""
         """def getConfig(name):\n"""
@@ -1399,8 +4202,11 @@ def createConfig():
         cfg["mdir"],
         cfg["apidir"],
         sorted(apis),
+        os.path.join(cfg["ericDir"], moduleIndexName) if moduleIndex else "",
         macConfig,
     )
+    if moduleIndex:
+        config += moduleIndexFinder
     copyToFile(configName, config)
 
 
@@ -1436,12 +4242,34 @@ def createInstallInfo():
         installInfo["eric_edited"] = False
 
 
+def pipIndexOptions():
+    """
+    Function to get the pip options selecting the package sources.
+
+    @return list of pip options
+    @rtype list of str
+    """
+    global pipWheelhouse, pipLockFile
+
+    options = []
+    if pipWheelhouse:
+        options += ["--no-index", "--find-links", pipWheelhouse]
+    if pipLockFile:
+        options += ["--constraint", pipLockFile]
+    return options
+
+
 def pipInstall(packageName, message, force=True):
     """
-    Install the given package via pip.
+    Install the given package or packages via pip.
 
-    @param packageName name of the package to be installed
-    @type str
+    Several packages are installed by a single pip invocation. Should that
+    fail, they are installed one by one in order to not have a single
+    broken package prevent the installation of the others.
+
+    @param packageName name of the package to be installed or list of
+        packages (including an optional version constraint)
+    @type str or list of str
     @param message message to be shown to the user
     @type str
     @param force flag indicating to perform the installation
@@ -1452,19 +4280,21 @@ def pipInstall(packageName, message, force=True):
     """
     global yes2All
 
+    packageNames = [packageName] if isinstance(packageName, str) else packageName
+
     ok = False
     if yes2All or force:
         answer = "y"
     else:
         print(
             "{0}\nShall '{1}' be installed using pip? (Y/n)".format(
-                message, packageName
+                message, "', '".join(packageNames)
             ),
             end=" ",
         )
         answer = input()  # secok
     if answer in ("", "Y", "y"):
-        exitCode = subprocess.run(  # secok
+        exitCode = runProcess(  # secok
             [
                 sys.executable,
                 "-m",
@@ -1472,24 +4302,87 @@ def pipInstall(packageName, message, force=True):
                 "install",
                 "--prefer-binary",
                 "--upgrade",
-                packageName,
             ]
+            + pipIndexOptions()
+            + packageNames
         ).returncode
         ok = exitCode == 0
+        if not ok and len(packageNames) > 1:
+            print("Installing the packages individually.")
+            results = [pipInstall(name, message) for name in packageNames]
+            ok = all(results)
 
     return ok
 
 
+def versionTuple(version):
+    """
+    Function to convert a version string into a tuple for comparisons.
+
+    Only the leading numerical parts of the version are regarded.
+
+    @param version version string to convert
+    @type str
+    @return tuple of the version numbers
+    @rtype tuple of int
+    """
+    match = re.match(r"\d+(?:\.\d+)*", version)
+    return tuple(int(v) for v in match.group(0).split(".")) if match else ()
+
+
+def isWheelhousePipOutdated():
+    """
+    Check, if pip is outdated compared to the pip packages of the wheelhouse.
+
+    @return flag indicating an outdated pip
+    @rtype bool
+    """
+    global pipWheelhouse
+
+    installed = distributionVersions(["pip"])["pip"]
+    if not installed:
+        return False
+
+    try:
+        packageFiles = os.listdir(pipWheelhouse)
+    except OSError:
+        packageFiles = []
+    available = [
+        match.group(1)
+        for match in (
+            re.match(r"pip-(\d[^-]*?)(?:-.*\.whl|\.tar\.gz|\.zip)$", f)
+            for f in packageFiles
+        )
+        if match
+    ]
+    latest = max(available, key=versionTuple, default=installed)
+    if versionTuple(latest) > versionTuple(installed):
+        print(
+            "'pip' is outdated (installed {0}, available {1})".format(installed, latest)
+        )
+        return True
+
+    return False
+
+
 def isPipOutdated():
     """
     Check, if pip is outdated.
 
+    With a wheelhouse the check is answered from its contents without
+    querying the package index.
+
     @return flag indicating an outdated pip
     @rtype bool
     """
+    global pipWheelhouse
+
+    if pipWheelhouse:
+        return isWheelhousePipOutdated()
+
     try:
         pipOut = (
-            subprocess.run(  # secok
+            runProcess(  # secok
                 [sys.executable, "-m", "pip", "list", "--outdated", "--format=json"],
                 check=True,
                 capture_output=True,
@@ -1529,8 +4422,10 @@ def updatePip():
         print("Shall 'pip' be updated (recommended)? (Y/n)", end=" ")
         answer = input()  # secok
     if answer in ("", "Y", "y"):
-        subprocess.run(  # secok
-            [sys.executable, "-m", "pip", "install", "--upgrade", "pip"]
+        runProcess(  # secok
+            [sys.executable, "-m", "pip", "install", "--upgrade"]
+            + pipIndexOptions()
+            + ["pip"]
         )
 
 
@@ -1550,11 +4445,351 @@ def versionToStr(version):
     return ".".join(str(p) for p in reversed(parts))
 
 
+def findModule(moduleName):
+    """
+    Function to check the availability of a module.
+
+    In probe mode the module is only searched for. Otherwise it is
+    imported into the installer process.
+
+    @param moduleName name of the module
+    @type str
+    @return error message (empty, if the module is available)
+    @rtype str
+    """
+    global probeDependencies, probeTimes
+
+    start = time.monotonic()
+    try:
+        if probeDependencies:
+            spec = importlib.util.find_spec(moduleName)
+            error = "" if spec else "No module named '{0}'".format(moduleName)
+        else:
+            __import__(moduleName)
+            error = ""
+    except (ImportError, ValueError) as err:
+        error = str(err)
+    probeTimes.append(
+        (
+            moduleName,
+            "find_spec" if probeDependencies else "import",
+            time.monotonic() - start,
+        )
+    )
+
+    return error
+
+
+def distributionVersion(distributionName):
+    """
+    Function to get the version of an installed distribution from its
+    metadata.
+
+    @param distributionName name of the distribution
+    @type str
+    @return version string or None, if the distribution is not installed
+    @rtype str
+    """
+    global probeTimes
+
+    start = time.monotonic()
+    try:
+        from importlib import metadata
+
+        version = metadata.version(distributionName)
+    except Exception:
+        # importlib.metadata is not available before Python 3.8
+        version = None
+    probeTimes.append((distributionName, "metadata", time.monotonic() - start))
+
+    return version
+
+
+def runProbe(name, code):
+    """
+    Function to run a probe script in a separate Python process.
+
+    @param name name of the probe
+    @type str
+    @param code Python code printing its result as JSON data
+    @type str
+    @return decoded result of the probe or None, if it failed
+    @rtype Any
+    """
+    global probeTimes
+
+    start = time.monotonic()
+    try:
+        probeOut = runProcess(  # secok
+            [sys.executable, "-c", code], check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(probeOut.strip().splitlines()[-1])
+    except (OSError, subprocess.CalledProcessError, ValueError, IndexError):
+        result = None
+    probeTimes.append((name, "subprocess", time.monotonic() - start))
+
+    return result
+
+
+def dependencyVersions():
+    """
+    Function to determine the versions of Qt and the PyQt6 packages.
+
+    In probe mode the version constants needed at runtime are determined
+    by short-lived subprocesses running in parallel and the others are
+    taken from the distribution metadata.
+
+    @return dictionary containing the Qt version string, tuples of version
+        number and version string for 'pyqt', 'qscintilla' and 'sip' and
+        the version strings for 'charts' and 'webengine' (None, if not
+        available)
+    @rtype dict
+    """
+    global probeDependencies
+
+    if probeDependencies:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            pyqtFuture = executor.submit(
+                phaseTask(runProbe),
+                "PyQt6.QtCore",
+                "import json\n"
+                "from PyQt6.QtCore import PYQT_VERSION, PYQT_VERSION_STR, qVersion\n"
+                "try:\n"
+                "    try:\n"
+                "        from PyQt6 import sip\n"
+                "    except ImportError:\n"
+                "        import sip\n"
+                "    sipVersion = [sip.SIP_VERSION, sip.SIP_VERSION_STR]\n"
+                "except (ImportError, AttributeError):\n"
+                "    sipVersion = None\n"
+                "print(json.dumps({'qt': qVersion(),"
+                " 'pyqt': [PYQT_VERSION, PYQT_VERSION_STR], 'sip': sipVersion}))\n",
+            )
+            qsciFuture = executor.submit(
+                phaseTask(runProbe),
+                "PyQt6.Qsci",
+                "import json\n"
+                "from PyQt6.Qsci import QSCINTILLA_VERSION, QSCINTILLA_VERSION_STR\n"
+                "print(json.dumps([QSCINTILLA_VERSION, QSCINTILLA_VERSION_STR]))\n",
+            )
+            versions = {
+                "charts": distributionVersion("PyQt6-Charts"),
+                "webengine": distributionVersion("PyQt6-WebEngine"),
+            }
+            pyqtVersions = pyqtFuture.result()
+            qsciVersion = qsciFuture.result()
+
+        if not pyqtVersions:
+            print("Sorry, the PyQt6 version could not be determined.")
+            exit(1)
+        if not qsciVersion:
+            print("Sorry, the PyQt6-QScintilla version could not be determined.")
+            exit(1)
+        versions["qt"] = pyqtVersions["qt"]
+        versions["pyqt"] = tuple(pyqtVersions["pyqt"])
+        versions["sip"] = tuple(pyqtVersions["sip"]) if pyqtVersions["sip"] else None
+        versions["qscintilla"] = tuple(qsciVersion)
+        return versions
+
+    from PyQt6.QtCore import PYQT_VERSION, PYQT_VERSION_STR, qVersion
+    from PyQt6.Qsci import QSCINTILLA_VERSION, QSCINTILLA_VERSION_STR
+
+    versions = {
+        "qt": qVersion(),
+        "pyqt": (PYQT_VERSION, PYQT_VERSION_STR),
+        "qscintilla": (QSCINTILLA_VERSION, QSCINTILLA_VERSION_STR),
+        "sip": None,
+        "charts": None,
+        "webengine": None,
+    }
+    with contextlib.suppress(ImportError, AttributeError):
+        try:
+            from PyQt6 import sip
+        except ImportError:
+            import sip
+        versions["sip"] = (sip.SIP_VERSION, sip.SIP_VERSION_STR)
+    with contextlib.suppress(ImportError, AttributeError):
+        from PyQt6 import QtCharts
+
+        versions["charts"] = QtCharts.PYQT_CHART_VERSION_STR
+    with contextlib.suppress(ImportError, AttributeError):
+        from PyQt6 import QtWebEngineCore
+
+        versions["webengine"] = QtWebEngineCore.PYQT_WEBENGINE_VERSION_STR
+
+    return versions
+
+
+def distributionVersions(distributionNames):
+    """
+    Function to get the versions of installed distributions from their
+    metadata.
+
+    @param distributionNames names of the distributions
+    @type list of str
+    @return dictionary containing the version string for each distribution
+        (None, if it is not installed)
+    @rtype dict
+    """
+    try:
+        from importlib import metadata
+    except ImportError:
+        # importlib.metadata is not available before Python 3.8
+        return dict.fromkeys(distributionNames)
+
+    versions = {}
+    for name in distributionNames:
+        try:
+            versions[name] = metadata.version(name)
+        except Exception:
+            versions[name] = None
+    return versions
+
+
+def writeLockFile(fileName, distributionNames):
+    """
+    Function to write the versions of the installed dependencies to a lock
+    file usable as a pip constraints file.
+
+    @param fileName name of the lock file
+    @type str
+    @param distributionNames names of the distributions
+    @type list of str
+    """
+    versions = distributionVersions(distributionNames)
+    try:
+        with open(fileName, "w", encoding="utf-8") as f:
+            f.write(
+                "# eric dependencies resolved for Python {0}.{1}.{2}\n".format(
+                    *sys.version_info[:3]
+                )
+            )
+            for name in distributionNames:
+                if versions[name]:
+                    f.write("{0}=={1}\n".format(name, versions[name]))
+    except OSError as msg:
+        sys.stderr.write("Error: {0}\nCould not write the lock file.\n".format(msg))
+        exit(7)
+    print("Wrote the resolved dependencies to {0}.".format(fileName))
+
+
+def readLockFile(fileName):
+    """
+    Function to read the versions pinned by a lock file.
+
+    @param fileName name of the lock file
+    @type str
+    @return dictionary containing the pinned version for each distribution
+    @rtype dict
+    """
+    lockedVersions = {}
+    try:
+        with open(fileName, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if "==" in line:
+                    name, version = line.split("==", 1)
+                    lockedVersions[name.strip()] = version.split(";", 1)[0].strip()
+    except OSError as msg:
+        sys.stderr.write("Error: {0}\nCould not read the lock file.\n".format(msg))
+        exit(7)
+    return lockedVersions
+
+
+def dependencyCacheFile():
+    """
+    Function to get the name of the file caching the result of the dependency
+    checks for the running interpreter.
+
+    @return name of the cache file
+    @rtype str
+    """
+    return os.path.join(
+        cacheDirectory("dependencies"),
+        hashlib.sha256(sys.executable.encode("utf-8")).hexdigest()[:16] + ".json",
+    )
+
+
+def dependencyCacheKey(distributionNames, isSudo):
+    """
+    Function to calculate the key identifying the state of the environment
+    checked for dependencies.
+
+    The key is built from the interpreter, the versions of the given
+    distributions, the modification times of the directories of the
+    module search path, which change whenever packages are installed or
+    removed, and the package sources (i.e. the wheelhouse and the contents
+    of the lock file).
+
+    @param distributionNames names of the distributions to be checked
+    @type list of str
+    @param isSudo flag indicating an installation via sudo
+    @type bool
+    @return key of the environment state
+    @rtype str
+    """
+    global withPyqt6Tools, pipWheelhouse, pipLockFile
+
+    pathTimes = {}
+    for path in sys.path[1:]:
+        # the first entry is the directory of the install script
+        with contextlib.suppress(OSError):
+            if os.path.isdir(path):
+                pathTimes[path] = os.stat(path).st_mtime_ns
+
+    state = {
+        "executable": sys.executable,
+        "version": sys.version,
+        "distributions": distributionVersions(distributionNames),
+        "paths": pathTimes,
+        "pyqt6Tools": withPyqt6Tools,
+        "sudo": isSudo,
+        "wheelhouse": pipWheelhouse,
+        "lock": fileHash(pipLockFile) if pipLockFile else "",
+    }
+    return hashlib.sha256(json.dumps(state, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def readDependencyCache():
+    """
+    Function to read the key stored by the last successful dependency check.
+
+    @return stored key or an empty string, if there is none
+    @rtype str
+    """
+    global verbose
+
+    try:
+        with open(dependencyCacheFile(), "r", encoding="utf-8") as f:
+            cacheKey = json.load(f)["key"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return ""
+
+    if verbose:
+        print("Dependency check cache: {0}".format(dependencyCacheFile()))
+    return cacheKey
+
+
+def writeDependencyCache(cacheKey):
+    """
+    Function to store the key of a successful dependency check.
+
+    @param cacheKey key of the checked environment state
+    @type str
+    """
+    cacheFile = dependencyCacheFile()
+    with contextlib.suppress(OSError):
+        os.makedirs(os.path.dirname(cacheFile), exist_ok=True)
+        with open(cacheFile + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"key": cacheKey, "checked": time.time()}, f)
+        os.replace(cacheFile + ".tmp", cacheFile)
+
+
 def doDependancyChecks():
     """
     Perform some dependency checks.
     """
-    global verbose
+    global verbose, probeDependencies, probeTimes, writeLockFileName, pipLockFile
 
     requiredVersions = {
         "pyqt6": 0x60200,  # v6.2.0
@@ -1570,121 +4805,6 @@ def doDependancyChecks():
     except AttributeError:
         isSudo = False
 
-    print("Checking dependencies")
-
-    # update pip first even if we don't need to install anything
-    if not isSudo and isPipOutdated():
-        updatePip()
-        print("\n")
-
-    # perform dependency checks
-    if sys.version_info < (3, 7, 0) or sys.version_info >= (3, 12, 0):
-        print("Sorry, you must have Python 3.7.0 or higher, but less 3.12.0.")
-        print("Yours is {0}.".format(".".join(str(v) for v in sys.version_info[:3])))
-        exit(5)
-
-    try:
-        import xml.etree  # __IGNORE_WARNING__
-    except ImportError:
-        print("Your Python installation is missing the XML module.")
-        print("Please install it and try again.")
-        exit(5)
-
-    try:
-        from PyQt6.QtCore import qVersion
-    except ImportError as err:
-        msg = "'PyQt6' could not be detected.{0}".format(
-            "\nError: {0}".format(err) if verbose else ""
-        )
-        installed = not isSudo and pipInstall(
-            "PyQt6>={0}".format(versionToStr(requiredVersions["pyqt6"])), msg
-        )
-        if installed:
-            # try to import it again
-            try:
-                from PyQt6.QtCore import qVersion
-            except ImportError as msg:
-                print("Sorry, please install PyQt6.")
-                print("Error: {0}".format(msg))
-                exit(1)
-        else:
-            print("Sorry, please install PyQt6.")
-            print("Error: {0}".format(msg))
-            exit(1)
-    print("Found PyQt6")
-
-    try:
-        pyuic = "pyuic6"
-        from PyQt6 import uic  # __IGNORE_WARNING__
-    except ImportError as err:
-        print("Sorry, {0} is not installed.".format(pyuic))
-        if verbose:
-            print("Error: {0}".format(err))
-        exit(1)
-    print("Found {0}".format(pyuic))
-
-    try:
-        from PyQt6 import QtWebEngineWidgets  # __IGNORE_WARNING__
-    except ImportError as err:
-        if isSudo:
-            print("Optional 'PyQt6-WebEngine' could not be detected.")
-        else:
-            msg = "Optional 'PyQt6-WebEngine' could not be detected.{0}".format(
-                "\nError: {0}".format(err) if verbose else ""
-            )
-            pipInstall(
-                "PyQt6-WebEngine>={0}".format(
-                    versionToStr(requiredVersions["pyqt6-webengine"])
-                ),
-                msg,
-            )
-
-    try:
-        from PyQt6 import QtCharts  # __IGNORE_WARNING__
-    except ImportError as err:
-        if isSudo:
-            print("Optional 'PyQt6-Charts' could not be detected.")
-        else:
-            msg = "Optional 'PyQt6-Charts' could not be detected.{0}".format(
-                "\nError: {0}".format(err) if verbose else ""
-            )
-            pipInstall(
-                "PyQt6-Charts>={0}".format(
-                    versionToStr(requiredVersions["pyqt6-charts"])
-                ),
-                msg,
-            )
-    print("Found PyQt6-Charts")
-
-    try:
-        from PyQt6 import Qsci  # __IGNORE_WARNING__
-    except ImportError as err:
-        msg = "'PyQt6-QScintilla' could not be detected.{0}".format(
-            "\nError: {0}".format(err) if verbose else ""
-        )
-        installed = not isSudo and pipInstall(
-            "PyQt6-QScintilla>={0}".format(
-                versionToStr(requiredVersions["pyqt6-qscintilla"])
-            ),
-            msg,
-        )
-        if installed:
-            # try to import it again
-            try:
-                from PyQt6 import Qsci  # __IGNORE_WARNING__
-
-                message = None
-            except ImportError as msg:
-                message = str(msg)
-        else:
-            message = "PyQt6-QScintilla could not be installed."
-        if message:
-            print("Sorry, please install QScintilla2 and")
-            print("its PyQt6 wrapper.")
-            print("Error: {0}".format(message))
-            exit(1)
-    print("Found PyQt6-QScintilla")
-
     pyqt6BaseModulesList = [
         "PyQt6.QtGui",
         "PyQt6.QtNetwork",
@@ -1723,14 +4843,173 @@ def doDependancyChecks():
     if withPyqt6Tools:
         optionalModulesList["qt6-applications"] = ("qt6_applications", "")
 
+    # each entry is a tuple of pip project name, module name, pip install
+    # requirement and a flag indicating a required package
+    packagesList = [
+        (
+            "PyQt6",
+            "PyQt6.QtCore",
+            "PyQt6>={0}".format(versionToStr(requiredVersions["pyqt6"])),
+            True,
+        ),
+        (
+            "PyQt6-WebEngine",
+            "PyQt6.QtWebEngineWidgets",
+            "PyQt6-WebEngine>={0}".format(
+                versionToStr(requiredVersions["pyqt6-webengine"])
+            ),
+            False,
+        ),
+        (
+            "PyQt6-Charts",
+            "PyQt6.QtCharts",
+            "PyQt6-Charts>={0}".format(versionToStr(requiredVersions["pyqt6-charts"])),
+            False,
+        ),
+        (
+            "PyQt6-QScintilla",
+            "PyQt6.Qsci",
+            "PyQt6-QScintilla>={0}".format(
+                versionToStr(requiredVersions["pyqt6-qscintilla"])
+            ),
+            True,
+        ),
+    ]
+    packagesList.extend(
+        (package, moduleName, package + constraint, True)
+        for package, (moduleName, constraint) in requiredModulesList.items()
+    )
+    packagesList.extend(
+        (package, moduleName, package + constraint, False)
+        for package, (moduleName, constraint) in optionalModulesList.items()
+    )
+
+    print("Checking dependencies")
+
+    # skip the checks, if the environment did not change since the last
+    # successful check
+    distributionNames = [p[0] for p in packagesList] + ["PyQt6-Qt6", "PyQt6-sip"]
+    if readDependencyCache() == dependencyCacheKey(distributionNames, isSudo):
+        print("The environment did not change since the last successful check.")
+        if writeLockFileName:
+            writeLockFile(writeLockFileName, distributionNames)
+        print()
+        print("All dependencies ok.")
+        print()
+        return
+
+    # update pip first even if we don't need to install anything
+    if not isSudo and isPipOutdated():
+        updatePip()
+        print("\n")
+
+    # perform dependency checks
+    if sys.version_info < (3, 7, 0) or sys.version_info >= (3, 12, 0):
+        print("Sorry, you must have Python 3.7.0 or higher, but less 3.12.0.")
+        print("Yours is {0}.".format(".".join(str(v) for v in sys.version_info[:3])))
+        exit(5)
+
+    if findModule("xml.etree"):
+        print("Your Python installation is missing the XML module.")
+        print("Please install it and try again.")
+        exit(5)
+
+    # detect the missing packages
+    missingPackages = []
+    for package, moduleName, requirement, required in packagesList:
+        err = findModule(moduleName)
+        if err:
+            print(
+                "{0} '{1}' could not be detected.".format(
+                    "Required" if required else "Optional", package
+                )
+            )
+            if verbose:
+                print("Error: {0}".format(err))
+            missingPackages.append((package, moduleName, requirement, required))
+        else:
+            print("Found", package)
+
+    # install the missing packages with one pip run each for the required
+    # and the optional ones
+    if missingPackages and not isSudo:
+        for required in (True, False):
+            requirements = [p[2] for p in missingPackages if p[3] == required]
+            if requirements:
+                print(
+                    "\nInstalling {0} packages: {1}".format(
+                        "required" if required else "optional",
+                        ", ".join(requirements),
+                    )
+                )
+                pipInstall(requirements, "")
+        print()
+
+    # reinstall the installed packages, that differ from the lock file
+    if pipLockFile:
+        lockedVersions = readLockFile(pipLockFile)
+        installedVersions = distributionVersions(list(lockedVersions))
+        changedPackages = [
+            "{0}=={1}".format(name, version)
+            for name, version in lockedVersions.items()
+            if installedVersions[name] and installedVersions[name] != version
+        ]
+        if changedPackages:
+            if isSudo:
+                print(
+                    "These packages differ from the lock file: {0}".format(
+                        ", ".join(changedPackages)
+                    )
+                )
+            else:
+                print(
+                    "\nReinstalling packages differing from the lock file: {0}".format(
+                        ", ".join(changedPackages)
+                    )
+                )
+                pipInstall(changedPackages, "")
+                print()
+
+    # check the results of the installation
+    importlib.invalidate_caches()
+    missingErrors = {}
+    for package, moduleName, _, _ in missingPackages:
+        err = findModule(moduleName)
+        if err:
+            missingErrors[package] = err
+            if not isSudo:
+                print("'{0}' could not be installed.".format(package))
+        else:
+            print("Installed", package)
+
+    if "PyQt6" in missingErrors:
+        print("Sorry, please install PyQt6.")
+        print("Error: {0}".format(missingErrors["PyQt6"]))
+        exit(1)
+
+    pyuic = "pyuic6"
+    err = findModule("PyQt6.uic")
+    if err:
+        print("Sorry, {0} is not installed.".format(pyuic))
+        if verbose:
+            print("Error: {0}".format(err))
+        exit(1)
+    print("Found {0}".format(pyuic))
+
+    if "PyQt6-QScintilla" in missingErrors:
+        print("Sorry, please install QScintilla2 and")
+        print("its PyQt6 wrapper.")
+        print("Error: {0}".format(missingErrors["PyQt6-QScintilla"]))
+        exit(1)
+
     # check mandatory PyQt6 modules
     modulesOK = True
     for pyqt6BaseModule in pyqt6BaseModulesList:
         name = pyqt6BaseModule.split(".")[1]
-        try:
-            __import__(pyqt6BaseModule)
+        err = findModule(pyqt6BaseModule)
+        if not err:
             print("Found", name)
-        except ImportError as err:
+        else:
             print("Sorry, please install {0}.".format(name))
             if verbose:
                 print("Error: {0}".format(err))
@@ -1738,45 +5017,13 @@ def doDependancyChecks():
     if not modulesOK:
         exit(1)
 
-    # check required modules
-    requiredMissing = False
-    for requiredPackage in requiredModulesList:
-        try:
-            __import__(requiredModulesList[requiredPackage][0])
-            print("Found", requiredPackage)
-        except ImportError as err:
-            if isSudo:
-                print("Required '{0}' could not be detected.".format(requiredPackage))
-                requiredMissing = True
-            else:
-                msg = "Required '{0}' could not be detected.{1}".format(
-                    requiredPackage, "\nError: {0}".format(err) if verbose else ""
-                )
-                pipInstall(
-                    requiredPackage + requiredModulesList[requiredPackage][1],
-                    msg,
-                    force=True,
-                )
+    requiredMissing = any(p in missingErrors for p in requiredModulesList)
     if requiredMissing:
         print("Some required packages are missing and could not be installed.")
         print("Install them manually with:")
         print("    {0} install-dependencies.py --required".format(sys.executable))
 
-    # check optional modules
-    optionalMissing = False
-    for optPackage in optionalModulesList:
-        try:
-            __import__(optionalModulesList[optPackage][0])
-            print("Found", optPackage)
-        except ImportError as err:
-            if isSudo:
-                print("Optional '{0}' could not be detected.".format(optPackage))
-                optionalMissing = True
-            else:
-                msg = "Optional '{0}' could not be detected.{1}".format(
-                    optPackage, "\nError: {0}".format(err) if verbose else ""
-                )
-                pipInstall(optPackage + optionalModulesList[optPackage][1], msg)
+    optionalMissing = any(p in missingErrors for p in optionalModulesList)
     if optionalMissing:
         print("Some optional packages are missing and could not be installed.")
         print("Install them manually with:")
@@ -1794,6 +5041,8 @@ def doDependancyChecks():
     else:
         PlatformBlackLists = PlatformsBlackLists["mac"]
 
+    versions = dependencyVersions()
+
     print("\nVersion Information")
     print("-------------------")
 
@@ -1801,24 +5050,21 @@ def doDependancyChecks():
 
     # check version of Qt
     # ===================
-    qtMajor = int(qVersion().split(".")[0])
-    qtMinor = int(qVersion().split(".")[1])
-    print("Qt6: {0}".format(qVersion().strip()))
+    qtMajor = int(versions["qt"].split(".")[0])
+    qtMinor = int(versions["qt"].split(".")[1])
+    print("Qt6: {0}".format(versions["qt"].strip()))
     if qtMajor == 6 and qtMinor < 1:
         print("Sorry, you must have Qt version 6.1.0 or better.")
         exit(2)
 
     # check version of sip
     # ====================
-    with contextlib.suppress(ImportError, AttributeError):
-        try:
-            from PyQt6 import sip
-        except ImportError:
-            import sip
-        print("sip:", sip.SIP_VERSION_STR.strip())
+    if versions["sip"]:
+        SIP_VERSION, SIP_VERSION_STR = versions["sip"]
+        print("sip:", SIP_VERSION_STR.strip())
         # always assume, that snapshots or dev versions are new enough
-        if "snapshot" not in sip.SIP_VERSION_STR and "dev" not in sip.SIP_VERSION_STR:
-            if sip.SIP_VERSION < requiredVersions["sip"]:
+        if "snapshot" not in SIP_VERSION_STR and "dev" not in SIP_VERSION_STR:
+            if SIP_VERSION < requiredVersions["sip"]:
                 print(
                     "Sorry, you must have sip {0} or higher or"
                     " a recent development release.".format(
@@ -1828,7 +5074,7 @@ def doDependancyChecks():
                 exit(3)
             # check for blacklisted versions
             for vers in BlackLists["sip"] + PlatformBlackLists["sip"]:
-                if vers == sip.SIP_VERSION:
+                if vers == SIP_VERSION:
                     print(
                         "Sorry, sip version {0} is not compatible with eric.".format(
                             versionToStr(vers)
@@ -1839,7 +5085,7 @@ def doDependancyChecks():
 
     # check version of PyQt6
     # ======================
-    from PyQt6.QtCore import PYQT_VERSION, PYQT_VERSION_STR
+    PYQT_VERSION, PYQT_VERSION_STR = versions["pyqt"]
 
     print("PyQt6:", PYQT_VERSION_STR.strip())
     # always assume, that snapshots or dev versions are new enough
@@ -1865,7 +5111,7 @@ def doDependancyChecks():
 
     # check version of QScintilla
     # ===========================
-    from PyQt6.Qsci import QSCINTILLA_VERSION, QSCINTILLA_VERSION_STR
+    QSCINTILLA_VERSION, QSCINTILLA_VERSION_STR = versions["qscintilla"]
 
     print("PyQt6-QScintilla:", QSCINTILLA_VERSION_STR.strip())
     # always assume, that snapshots or dev versions are new enough
@@ -1877,63 +5123,654 @@ def doDependancyChecks():
                     versionToStr(requiredVersions["pyqt6-qscintilla"])
                 )
             )
-            exit(5)
-        # check for blacklisted versions
-        for vers in BlackLists["QScintilla2"] + PlatformBlackLists["QScintilla2"]:
-            if vers == QSCINTILLA_VERSION:
-                print(
-                    "Sorry, QScintilla2 version {0} is not compatible with"
-                    " eric.".format(versionToStr(vers))
+            exit(5)
+        # check for blacklisted versions
+        for vers in BlackLists["QScintilla2"] + PlatformBlackLists["QScintilla2"]:
+            if vers == QSCINTILLA_VERSION:
+                print(
+                    "Sorry, QScintilla2 version {0} is not compatible with"
+                    " eric.".format(versionToStr(vers))
+                )
+                print("Please install another version.")
+                exit(5)
+
+    # print version info for additional modules
+    if versions["charts"]:
+        print("PyQt6-Charts:", versions["charts"])
+    if versions["webengine"]:
+        print("PyQt6-WebEngine:", versions["webengine"])
+
+    if probeDependencies or verbose:
+        print("\nDependency Probes")
+        print("-----------------")
+        for name, method, duration in probeTimes:
+            print("{0:<32} {1:<10} {2:7.3f}s".format(name, method, duration))
+
+    if not missingErrors:
+        writeDependencyCache(dependencyCacheKey(distributionNames, isSudo))
+
+    if writeLockFileName:
+        writeLockFile(writeLockFileName, distributionNames)
+
+    print()
+    print("All dependencies ok.")
+    print()
+
+
+def __pyName(py_dir, py_file):
+    """
+    Local function to create the Python source file name for the compiled
+    .ui file.
+
+    @param py_dir suggested name of the directory (string)
+    @param py_file suggested name for the compile source file (string)
+    @return tuple of directory name (string) and source file name (string)
+    """
+    return py_dir, "Ui_{0}".format(py_file)
+
+
+def cacheDirectory(*subdirs):
+    """
+    Function to get the name of a directory for the installer caches.
+
+    @param subdirs names of the sub-directories
+    @type str
+    @return name of the cache directory
+    @rtype str
+    """
+    if sys.platform.startswith(("win", "cygwin")):
+        baseDir = os.getenv("LOCALAPPDATA") or os.path.expanduser(
+            os.path.join("~", "AppData", "Local")
+        )
+    elif sys.platform == "darwin":
+        baseDir = os.path.expanduser(os.path.join("~", "Library", "Caches"))
+    else:
+        baseDir = os.getenv("XDG_CACHE_HOME") or os.path.expanduser(
+            os.path.join("~", ".cache")
+        )
+    return os.path.join(baseDir, "eric7-install", *subdirs)
+
+
+def compileUiForm(uiPath, uiData=None):
+    """
+    Compile a .ui file to Python source code.
+
+    This function is executed in the worker processes of the form
+    compilation.
+
+    @param uiPath name of the .ui file
+    @type str
+    @param uiData contents of the .ui file (defaults to reading the file)
+    @type bytes
+    @return tuple containing the name of the .ui file, the generated source
+        code and an error message (empty, if compiled successfully)
+    @rtype tuple of (str, str, str)
+    """
+    try:
+        from PyQt6.uic import compileUi
+
+        if uiData is None:
+            uiFile = uiPath
+        else:
+            uiFile = io.BytesIO(uiData)
+            uiFile.name = uiPath
+        buffer = io.StringIO()
+        compileUi(uiFile, buffer)
+        return uiPath, buffer.getvalue(), ""
+    except Exception as err:
+        return uiPath, "", "{0}: {1}".format(uiPath, err)
+
+
+def writeUiSource(pyPath, code, uiPath):
+    """
+    Write the source code of a compiled form, if it differs from the
+    existing file.
+
+    Forms of a release archive are compiled into its in-memory contents with
+    the modification time of the form file.
+
+    @param pyPath name of the Python file
+    @type str
+    @param code source code of the compiled form
+    @type str
+    @param uiPath name of the form file
+    @type str
+    """
+    global sourceArchive
+
+    if isArchiveSource(pyPath):
+        data = code.encode("utf-8")
+        if sourceArchive.get(pyPath, [None])[0] != data:
+            addSourceMember(pyPath, data, sourceStat(uiPath)[2])
+        return
+
+    try:
+        with open(pyPath, "r", encoding="utf-8") as f:
+            upToDate = f.read() == code
+    except (OSError, UnicodeDecodeError):
+        upToDate = False
+    if not upToDate:
+        with open(pyPath, "w", encoding="utf-8") as f:
+            f.write(code)
+        countWrittenFile(os.path.getsize(pyPath))
+
+
+def compileUiFiles():
+    """
+    Compile the .ui files to Python sources.
+
+    The generated sources are kept in a cache keyed by the hash of the form
+    file, its path and the PyQt6 version, so that only changed forms need
+    to be compiled again. These are compiled by a pool of worker processes.
+    Unchanged Ui_*.py files are not rewritten.
+
+    @return flag indicating all forms were compiled successfully
+    @rtype bool
+    """
+    from PyQt6.QtCore import PYQT_VERSION_STR
+
+    cacheDir = cacheDirectory(
+        "ui",
+        hashlib.sha256(os.path.abspath(eric7SourceDir).encode("utf-8")).hexdigest()[
+            :16
+        ],
+    )
+    if not os.path.isdir(cacheDir):
+        os.makedirs(cacheDir)
+
+    usedEntries = set()
+    pending = []
+    for root, _, files in walkSource(eric7SourceDir):
+        for uiFile in [f for f in files if f.endswith(".ui")]:
+            uiPath = os.path.join(root, uiFile)
+            pyDir, pyFile = __pyName(root, uiFile[:-3] + ".py")
+            pyPath = os.path.join(pyDir, pyFile)
+
+            digest = hashlib.sha256(
+                "{0}\0{1}\0".format(PYQT_VERSION_STR, uiPath).encode("utf-8")
+            )
+            digest.update(readSourceFile(uiPath))
+            cacheEntry = digest.hexdigest() + ".py"
+            cacheFile = os.path.join(cacheDir, cacheEntry)
+            usedEntries.add(cacheEntry)
+
+            try:
+                with open(cacheFile, "r", encoding="utf-8") as f:
+                    writeUiSource(pyPath, f.read(), uiPath)
+            except OSError:
+                pending.append((uiPath, pyPath, cacheFile))
+
+    errors = []
+    if pending:
+        workers = min(workerCount(), len(pending))
+        try:
+            executor = processPool(workers) if workers > 1 else None
+        except (ImportError, NotImplementedError, OSError):
+            executor = None
+        try:
+            # forms of a release archive are passed on by their contents and
+            # named like they were extracted
+            uiPaths = [
+                os.path.relpath(uiPath, os.path.dirname(sourceDir))
+                if isArchiveSource(uiPath)
+                else uiPath
+                for uiPath, _, _ in pending
+            ]
+            uiDatas = [sourceArchive.get(uiPath, [None])[0] for uiPath, _, _ in pending]
+            results = (
+                executor.map(compileUiForm, uiPaths, uiDatas)
+                if executor
+                else map(compileUiForm, uiPaths, uiDatas)
+            )
+            for (_, code, error), (uiPath, pyPath, cacheFile) in zip(results, pending):
+                if error:
+                    errors.append(error)
+                    continue
+
+                with contextlib.suppress(OSError):
+                    with open(cacheFile + ".tmp", "w", encoding="utf-8") as f:
+                        f.write(code)
+                    os.replace(cacheFile + ".tmp", cacheFile)
+                writeUiSource(pyPath, code, uiPath)
+        finally:
+            if executor:
+                executor.shutdown()
+
+    # remove the cache entries of forms that have been changed or deleted
+    for cacheEntry in set(os.listdir(cacheDir)) - usedEntries:
+        with contextlib.suppress(OSError):
+            os.remove(os.path.join(cacheDir, cacheEntry))
+
+    print(
+        "{0} of {1} forms compiled, {2} taken from the cache.".format(
+            len(pending) - len(errors),
+            len(usedEntries),
+            len(usedEntries) - len(pending),
+        )
+    )
+    if errors:
+        print("The following forms could not be compiled:")
+        for error in errors:
+            print("    {0}".format(error))
+
+    return not errors
+
+
+def pycHeader(data, mtime, invalidation):
+    """
+    Function to create the header of a byte code file.
+
+    @param data contents of the source file
+    @type bytes
+    @param mtime modification time of the source file (in s)
+    @type int
+    @param invalidation how the byte code file is validated (one of
+        'timestamp', 'checked-hash' or 'unchecked-hash')
+    @type str
+    @return header of the byte code file
+    @rtype bytes
+    """
+    if invalidation == "timestamp":
+        return (
+            importlib.util.MAGIC_NUMBER
+            + (0).to_bytes(4, "little")
+            + (mtime & 0xFFFFFFFF).to_bytes(4, "little")
+            + (len(data) & 0xFFFFFFFF).to_bytes(4, "little")
+        )
+
+    flags = 0b11 if invalidation == "checked-hash" else 0b01
+    return (
+        importlib.util.MAGIC_NUMBER
+        + flags.to_bytes(4, "little")
+        + importlib.util.source_hash(data)
+    )
+
+
+def compileModule(
+    fullname, dfile, source=None, invalidation="timestamp", levels=None, legacy=""
+):
+    """
+    Compile a Python source file to byte code.
+
+    This function is executed in the worker processes of the compilation
+    stage. The byte code files of all requested optimization levels are
+    written by one call. Files with an up-to-date byte code file are skipped
+    like compileall does. Sources given by their contents are compiled in
+    memory. A legacy byte code file is installed in place of its source, so
+    that the module may be imported without it.
+
+    @param fullname name of the source file
+    @type str
+    @param dfile name of the source file to be recorded in the byte code
+    @type str
+    @param source tuple containing the contents and the modification time
+        (in ns) of the source file
+    @type tuple of (bytes, int)
+    @param invalidation how the byte code files are validated (one of
+        'timestamp', 'checked-hash' or 'unchecked-hash')
+    @type str
+    @param levels list of optimization levels (defaults to [0])
+    @type list of int
+    @param legacy name of the legacy byte code file to be written for the
+        first optimization level (empty for byte code files cached in the
+        __pycache__ directory)
+    @type str
+    @return tuple containing the name of the source file, the start and end
+        time of the compilation, the ID of the worker process, an error
+        message (empty, if compiled successfully), a dictionary with the
+        byte code file contents of a source compiled in memory per byte code
+        file name and the size of the byte code files written
+    @rtype tuple of (str, float, float, int, str, dict, int)
+    """
+    start = time.monotonic()
+    error = ""
+    levels = levels[:1] if legacy else levels or [0]
+    if source is not None:
+        data, mtimeNs = source
+        header = pycHeader(data, mtimeNs // 1000000000, invalidation)
+        pycs = {}
+        try:
+            for level in levels:
+                code = compile(data, dfile, "exec", dont_inherit=True, optimize=level)
+                pycs[legacy or byteCodeFile(fullname, level)] = header + marshal.dumps(
+                    code
+                )
+        except (SyntaxError, ValueError) as err:
+            error = str(py_compile.PyCompileError(err.__class__, err, dfile))
+            pycs = {}
+        return fullname, start, time.monotonic(), os.getpid(), error, pycs, 0
+
+    try:
+        with open(fullname, "rb") as f:
+            header = pycHeader(
+                f.read(), int(os.fstat(f.fileno()).st_mtime), invalidation
+            )
+    except OSError:
+        header = b""
+    written = 0
+    for level in levels:
+        cfile = legacy or byteCodeFile(fullname, level)
+        try:
+            with open(cfile, "rb") as f:
+                upToDate = bool(header) and f.read(16) == header
+        except OSError:
+            upToDate = False
+        if not upToDate:
+            try:
+                py_compile.compile(
+                    fullname,
+                    cfile=cfile,
+                    dfile=dfile,
+                    doraise=True,
+                    optimize=level,
+                    invalidation_mode=pycInvalidationMode(invalidation),
                 )
-                print("Please install another version.")
-                exit(5)
+                written += os.path.getsize(cfile)
+            except (py_compile.PyCompileError, OSError) as err:
+                error = str(err)
+                break
+    return fullname, start, time.monotonic(), os.getpid(), error, {}, written
 
-    # print version info for additional modules
-    with contextlib.suppress(NameError, AttributeError):
-        print("PyQt6-Charts:", QtCharts.PYQT_CHART_VERSION_STR)
 
-    with contextlib.suppress(ImportError, AttributeError):
-        from PyQt6 import QtWebEngineCore
+def byteCodeFile(fullname, level):
+    """
+    Function to get the name of the byte code file of a source file.
 
-        print("PyQt6-WebEngine:", QtWebEngineCore.PYQT_WEBENGINE_VERSION_STR)
+    @param fullname name of the source file
+    @type str
+    @param level optimization level
+    @type int
+    @return name of the byte code file
+    @rtype str
+    """
+    return importlib.util.cache_from_source(
+        fullname, optimization=level if level else ""
+    )
 
-    print()
-    print("All dependencies ok.")
-    print()
 
+def byteCodeCacheDir():
+    """
+    Function to get the name of the cache directory of the legacy byte code
+    files of a compact installation.
 
-def __pyName(py_dir, py_file):
+    @return name of the cache directory
+    @rtype str
     """
-    Local function to create the Python source file name for the compiled
-    .ui file.
+    global eric7SourceDir
 
-    @param py_dir suggested name of the directory (string)
-    @param py_file suggested name for the compile source file (string)
-    @return tuple of directory name (string) and source file name (string)
+    return cacheDirectory(
+        "pyc",
+        hashlib.sha256(os.path.abspath(eric7SourceDir).encode("utf-8")).hexdigest()[
+            :16
+        ],
+    )
+
+
+def legacyByteCodeFile(fullname):
     """
-    return py_dir, "Ui_{0}".format(py_file)
+    Function to get the name of the legacy byte code file of a source file
+    of a compact installation.
 
+    The byte code files of sources read from disk are written to a cache
+    directory in order to not leave them in the source tree. The ones of a
+    release archive are kept next to their source in its in-memory contents.
 
-def compileUiFiles():
+    @param fullname name of the source file
+    @type str
+    @return name of the legacy byte code file
+    @rtype str
     """
-    Compile the .ui files to Python sources.
+    global eric7SourceDir
+
+    if isArchiveSource(fullname):
+        return os.path.splitext(fullname)[0] + ".pyc"
+
+    return os.path.join(
+        byteCodeCacheDir(),
+        os.path.splitext(os.path.relpath(fullname, eric7SourceDir))[0] + ".pyc",
+    )
+
+
+def keepsSource(fullname):
     """
-    from PyQt6.uic import compileUiDir
+    Function to check, if a compact installation keeps the source of a
+    module.
 
-    compileUiDir(eric7SourceDir, True, __pyName)
+    The scripts started by the wrappers, the debug clients run by other
+    interpreters, the plug-in modules found by their file names and the
+    modules started by their file names (e.g. the background client or the
+    pip helper scripts, that may be run by other interpreters) keep their
+    sources. The latter are determined by scanning the sources for string
+    literals naming a Python file.
+
+    @param fullname name of the source file
+    @type str
+    @return flag indicating to keep the source file
+    @rtype bool
+    """
+    global eric7SourceDir, pathStartedModules
+
+    if pathStartedModules is None:
+        nameRe = re.compile(r"""["']([A-Za-z_][A-Za-z0-9_]*\.py)["']""")
+        pathStartedModules = set()
+        for root, _, files in walkSource(eric7SourceDir):
+            for name in files:
+                if name.endswith(".py"):
+                    with contextlib.suppress(OSError, UnicodeDecodeError):
+                        pathStartedModules.update(
+                            nameRe.findall(readSourceText(os.path.join(root, name)))
+                        )
+        pathStartedModules.discard("__init__.py")
+
+    relPath = os.path.relpath(fullname, eric7SourceDir)
+    return (
+        fnmatch.fnmatch(relPath, "eric7*.py")
+        or relPath.startswith(os.path.join("DebugClients", ""))
+        or fnmatch.fnmatch(relPath, os.path.join("Plugins", "Plugin*.py"))
+        or os.path.basename(relPath) in pathStartedModules
+    )
 
 
-def prepareInfoFile(fileName):
+def byteCodeOnly(copyList):
     """
-    Function to prepare an Info.py file when installing from source.
+    Function to select the files of the modules installed as legacy byte
+    code files.
+
+    For a compact installation, the sources of these modules are replaced by
+    their legacy byte code files and their cached byte code files are
+    skipped. Otherwise, legacy byte code files left over in the source tree
+    are skipped.
+
+    @param copyList list of tuples containing the source file name, the
+        destination file name and the permissions to be set
+    @type list of tuple of (str, str, int)
+    @return filtered list of files to be installed
+    @rtype list of tuple of (str, str, int)
+    """
+    global compactInstall
+
+    sources = {src for src, _, _ in copyList if src.endswith(".py")}
+    if not compactInstall:
+        return [
+            (src, dst, perm)
+            for src, dst, perm in copyList
+            if not (src.endswith(".pyc") and src[:-1] in sources)
+        ]
+
+    legacy = {}
+    for src in sources:
+        if not keepsSource(src):
+            pyc = legacyByteCodeFile(src)
+            if sourceExists(pyc):
+                legacy[src] = pyc
+
+    installList = []
+    for src, dst, perm in copyList:
+        if src in legacy:
+            installList.append((legacy[src], dst[:-3] + ".pyc", perm))
+        elif not (
+            (src.endswith(".pyc") and src[:-1] in legacy)
+            or (
+                os.path.basename(os.path.dirname(src)) == "__pycache__"
+                and os.path.join(
+                    os.path.dirname(os.path.dirname(src)),
+                    os.path.basename(src).split(".", 1)[0] + ".py",
+                )
+                in legacy
+            )
+        ):
+            installList.append((src, dst, perm))
+    return installList
 
-    @param fileName name of the Python file containing the info (string)
+
+def pycInvalidationMode(invalidation):
     """
-    if not fileName:
-        return
+    Function to get the py_compile invalidation mode for its name.
+
+    @param invalidation name of the invalidation mode (one of 'timestamp',
+        'checked-hash' or 'unchecked-hash')
+    @type str
+    @return invalidation mode
+    @rtype py_compile.PycInvalidationMode
+    """
+    return py_compile.PycInvalidationMode[invalidation.upper().replace("-", "_")]
+
+
+def compileSources(dirName, ddir, rx):
+    """
+    Compile all Python source files of a directory tree using a pool of
+    worker processes.
+
+    @param dirName name of the directory to be compiled
+    @type str
+    @param ddir name of the directory to be recorded in the byte code
+    @type str
+    @param rx regular expression of files to be skipped
+    @type re.Pattern
+    @return flag indicating all files were compiled successfully
+    @rtype bool
+    """
+    global compileTimes, verbose, sourceArchive, pycInvalidation
+    global optimizationLevels, compactInstall
+
+    sources = []
+    dfiles = []
+    directories = [(dirName, ddir)]
+    while directories:
+        directory, dfileDir = directories.pop()
+        try:
+            entries = listSourceDir(directory, followSymlinks=False)
+        except OSError:
+            continue
+        for name, path, isDir in entries:
+            if isDir:
+                if name != "__pycache__":
+                    directories.append((path, os.path.join(dfileDir, name)))
+            elif name.endswith(".py") and not rx.search(path):
+                sources.append(path)
+                dfiles.append(os.path.join(dfileDir, name))
+    # the sources of a release archive are compiled from memory
+    contents = [sourceArchive.get(fullname) for fullname in sources]
+    invalidations = [pycInvalidation] * len(sources)
+    # a compact installation contains legacy byte code files with stripped
+    # docstrings instead of most sources
+    legacies = [
+        legacyByteCodeFile(fullname)
+        if compactInstall and not keepsSource(fullname)
+        else ""
+        for fullname in sources
+    ]
+    levels = [[2] if legacy else optimizationLevels for legacy in legacies]
+
+    start = time.monotonic()
+    workers = min(workerCount(), max(1, len(sources)))
+    chunkSize = max(1, len(sources) // (workers * 8))
+    try:
+        executor = processPool(workers)
+    except (ImportError, NotImplementedError, OSError):
+        executor = None
+        workers = 1
+    try:
+        results = (
+            executor.map(
+                compileModule,
+                sources,
+                dfiles,
+                contents,
+                invalidations,
+                levels,
+                legacies,
+                chunksize=chunkSize,
+            )
+            if executor
+            else map(
+                compileModule,
+                sources,
+                dfiles,
+                contents,
+                invalidations,
+                levels,
+                legacies,
+            )
+        )
+        showProgress = sys.stdout.isatty()
+        failed = []
+        for count, result in enumerate(results, 1):
+            fullname, begin, end, pid, error, pycs, written = result
+            compileTimes[fullname] = (begin, end, pid)
+            if written:
+                countWrittenFile(written)
+            if error:
+                failed.append(error)
+            for cfile, pyc in pycs.items():
+                addSourceMember(cfile, pyc, sourceStat(fullname)[2])
+            if showProgress:
+                print("\r{0}/{1} modules".format(count, len(sources)), end="")
+        if showProgress:
+            print()
+    finally:
+        if executor:
+            executor.shutdown()
+
+    if compactInstall and not isArchiveSource(dirName):
+        # remove the cached byte code files of deleted modules
+        usedFiles = set(legacies)
+        for root, _, files in os.walk(byteCodeCacheDir()):
+            for name in files:
+                if os.path.join(root, name) not in usedFiles:
+                    with contextlib.suppress(OSError):
+                        os.remove(os.path.join(root, name))
+
+    print(
+        "Compiled {0} modules ({1} byte code, optimization level {2}) in {3:.1f}s"
+        " using {4} process(es).".format(
+            len(sources),
+            pycInvalidation,
+            ", ".join(str(level) for level in optimizationLevels),
+            time.monotonic() - start,
+            workers,
+        )
+    )
+    slowest = sorted(
+        compileTimes.items(), key=lambda item: item[1][1] - item[1][0], reverse=True
+    )
+    for fullname, (begin, end, _pid) in slowest if verbose else slowest[:10]:
+        print(
+            "    {0:7.3f}s  {1}".format(end - begin, os.path.relpath(fullname, dirName))
+        )
+    for error in failed:
+        print(error)
+
+    return not failed
+
+
+def identifyRevision():
+    """
+    Function to determine the revision of the repository containing the
+    sources.
+    """
+    global sourceRevision
 
-    with contextlib.suppress(OSError):
-        os.rename(fileName, fileName + ".orig")
     localHg = (
         os.path.join(sys.exec_prefix, "Scripts", "hg.exe")
         if sys.platform.startswith(("win", "cygwin"))
@@ -1941,21 +5778,37 @@ def prepareInfoFile(fileName):
     )
     for hg in (localHg, "hg"):
         with contextlib.suppress(OSError, subprocess.CalledProcessError):
-            hgOut = subprocess.run(  # secok
+            hgOut = runProcess(  # secok
                 [hg, "identify", "-i"], check=True, capture_output=True, text=True
             ).stdout
             if hgOut:
                 break
     else:
         hgOut = ""
-    if hgOut:
-        hgOut = hgOut.strip()
-        if hgOut.endswith("+"):
-            hgOut = hgOut[:-1]
+    hgOut = hgOut.strip()
+    if hgOut.endswith("+"):
+        hgOut = hgOut[:-1]
+    sourceRevision = hgOut
+
+
+def prepareInfoFile(fileName):
+    """
+    Function to prepare an Info.py file when installing from source.
+
+    @param fileName name of the Python file containing the info (string)
+    """
+    global sourceRevision
+
+    if not fileName:
+        return
+
+    with contextlib.suppress(OSError):
+        os.rename(fileName, fileName + ".orig")
+    if sourceRevision:
         with open(fileName + ".orig", "r", encoding="utf-8") as f:
             text = f.read()
-        text = text.replace("@@REVISION@@", hgOut).replace(
-            "@@VERSION@@", "rev_" + hgOut
+        text = text.replace("@@REVISION@@", sourceRevision).replace(
+            "@@VERSION@@", "rev_" + sourceRevision
         )
         copyToFile(fileName, text)
     else:
@@ -2008,6 +5861,8 @@ def createWindowsShortcut(linkPath, targetPath, iconPath):
         shortcut.WorkingDirectory = os.path.dirname(targetPath)
         shortcut.IconLocation = iconPath
         shortcut.save()
+    if os.path.exists(linkPath):
+        recordInstalledFile(linkPath)
 
 
 def windowsDesktopNames():
@@ -2060,6 +5915,170 @@ def windowsProgramsEntry():
     return "eric7 (Python {0}.{1})".format(majorVersion, minorVersion)
 
 
+def prepareSource():
+    """
+    Clean up the sources, when installing from source, and prepare the
+    Info.py file of a repository.
+    """
+    global sourceDir, eric7SourceDir, infoName
+
+    print("Cleaning up source ...")
+    cleanupSource(sourceDir)
+    print()
+
+    if os.path.exists(os.path.join(sourceDir, ".hg")):
+        # we are installing from source with repo
+        infoName = os.path.join(eric7SourceDir, "UI", "Info.py")
+        prepareInfoFile(infoName)
+
+
+def removeOldInstallation():
+    """
+    Remove the old installation or determine the files to be updated by an
+    incremental or staged installation.
+    """
+    global distDir, doCleanup, cfg, incrementalInstall, stagedInstall
+    global previousManifest, obsoleteManifest, obsoleteDirectories
+    global installDirectories, installArchive, installStateLock
+
+    # finish an interrupted staged installation and remove the tombstones
+    # of previous runs
+    recoverStagedInstall(actualPath(cfg["ericDir"]))
+    removeTombstones(
+        tombstoneNames(actualPath(cfg["ericDir"]))
+        + (tombstoneNames(distDir) if distDir else [])
+    )
+
+    # cleanup old installation
+    manifestFile = os.path.join(actualPath(cfg["ericDir"]), installManifestName)
+    oldManifest, oldDirectories = readInstallManifest(manifestFile)
+    if incrementalInstall:
+        if oldManifest:
+            previousManifest = oldManifest
+            with installStateLock:
+                installDirectories.update(
+                    d for d in oldDirectories if os.path.isdir(actualPath(d))
+                )
+        else:
+            print("No manifest of a previous installation found.")
+        obsoleteManifest = previousManifest
+        obsoleteDirectories = oldDirectories
+    elif stagedInstall:
+        # the live installation is replaced as a whole after the new one
+        # was built, obsolete files outside of it are removed afterwards
+        ericDir = os.path.normpath(cfg["ericDir"])
+        obsoleteManifest = {
+            f: e for f, e in oldManifest.items() if not f.startswith(ericDir + os.sep)
+        }
+        obsoleteDirectories = [
+            d for d in oldDirectories if not d.startswith(ericDir + os.sep)
+        ]
+    print("Cleaning up old installation ...")
+    try:
+        if (
+            doCleanup
+            and not previousManifest
+            and not stagedInstall
+            and installArchive is None
+        ):
+            if distDir:
+                buryDirectory(distDir)
+            else:
+                # move the old eric tree out of the way first
+                ericDir = os.path.normpath(cfg["ericDir"])
+                buryDirectory(ericDir)
+                if oldManifest:
+                    removeInstalledFiles(
+                        {
+                            f: e
+                            for f, e in oldManifest.items()
+                            if not f.startswith(ericDir + os.sep)
+                        },
+                        [
+                            d
+                            for d in oldDirectories
+                            if d != ericDir and not d.startswith(ericDir + os.sep)
+                        ],
+                    )
+                else:
+                    cleanUp()
+    except OSError as msg:
+        sys.stderr.write("Error: {0}\nTry install as root.\n".format(msg))
+        exit(7)
+
+
+def writeConfiguration():
+    """
+    Create the config file replacing the development one and record the
+    information about the installation.
+    """
+    global configName, installFromSource
+
+    # get rid of development config file, if it exists
+    with contextlib.suppress(OSError):
+        if installFromSource:
+            os.rename(configName, configName + ".orig")
+            configNameC = configName + "c"
+            if os.path.exists(configNameC):
+                os.remove(configNameC)
+        os.remove(configName)
+
+    print("\nCreating configuration file ...")
+    createConfig()
+
+    createInstallInfo()
+
+
+def compileForms():
+    """
+    Compile the .ui files, that were changed or added.
+    """
+    global sourceDir
+
+    print("\nCompiling user interface files ...")
+    # step 1: remove Ui_*.py files of deleted forms
+    for root, _, files in walkSource(sourceDir):
+        removeStaleUiFiles(root, files)
+    # step 2: compile the changed forms
+    if not compileUiFiles():
+        exit(8)
+
+
+def compileEric():
+    """
+    Compile the Python sources and the config file.
+    """
+    global distDir, modDir, cfg, configName, eric7SourceDir, pycInvalidation
+    global optimizationLevels
+
+    print("\nCompiling source files ...")
+    skipRe = re.compile(r"DebugClients[\\/]Python[\\/]")
+    if distDir:
+        compileSources(
+            eric7SourceDir,
+            os.path.join(distDir, modDir, cfg["ericDir"]),
+            skipRe,
+        )
+        configDfile = os.path.join(distDir, modDir, "eric7config.py")
+    else:
+        compileSources(
+            eric7SourceDir,
+            os.path.join(modDir, cfg["ericDir"]),
+            skipRe,
+        )
+        configDfile = os.path.join(modDir, "eric7config.py")
+    for level in optimizationLevels:
+        py_compile.compile(
+            configName,
+            cfile=importlib.util.cache_from_source(
+                configName, optimization=level if level else ""
+            ),
+            dfile=configDfile,
+            optimize=level,
+            invalidation_mode=pycInvalidationMode(pycInvalidation),
+        )
+
+
 def main(argv):
     """
     The main function of the script.
@@ -2071,12 +6090,19 @@ def main(argv):
 
     # Parse the command line.
     global progName, modDir, doCleanup, doCompile, distDir, cfg, apisDir
-    global sourceDir, eric7SourceDir, configName
+    global sourceDir, eric7SourceDir, configName, sourceArchive
     global macAppBundlePath, macAppBundleName, macPythonExe
     global installApis, doCleanDesktopLinks, yes2All
     global createInstallInfoFile, installCwd
     global withPyqt6Tools
     global verbose
+    global installJobs, incrementalInstall
+    global probeDependencies, pipWheelhouse, pipLockFile, writeLockFileName
+    global stagedInstall, copyStrategy, traceFileName
+    global profileCpu, profileMemory, profilePhases
+    global installFromSource, infoName, obsoleteManifest, obsoleteDirectories
+    global pycInvalidation, optimizationLevels, compactInstall, zipBundle
+    global moduleIndex
 
     if sys.version_info < (3, 7, 0) or sys.version_info > (3, 99, 99):
         print("Sorry, eric requires at least Python 3.7 for running.")
@@ -2091,25 +6117,42 @@ def main(argv):
 
     initGlobals()
 
+    longOptions = [
+        "archive=",
+        "compact",
+        "copy-strategy=",
+        "from-archive=",
+        "help",
+        "incremental",
+        "lock=",
+        "module-index",
+        "no-apis",
+        "no-info",
+        "no-tools",
+        "optimize=",
+        "probe-deps",
+        "profile",
+        "profile-memory",
+        "profile-phases=",
+        "pyc-invalidation=",
+        "staged",
+        "trace=",
+        "uninstall",
+        "verbose",
+        "wheelhouse=",
+        "write-lock=",
+        "yes",
+        "zip-bundle",
+    ]
     try:
         if sys.platform.startswith(("win", "cygwin")):
-            optlist, args = getopt.getopt(
-                argv[1:],
-                "chvxza:b:d:f:",
-                ["help", "no-apis", "no-info", "no-tools", "verbose", "yes"],
-            )
+            optlist, args = getopt.getopt(argv[1:], "chvxza:b:d:f:j:", longOptions)
         elif sys.platform == "darwin":
             optlist, args = getopt.getopt(
-                argv[1:],
-                "chvxza:b:d:f:i:m:n:p:",
-                ["help", "no-apis", "no-info", "no-tools", "verbose", "yes"],
+                argv[1:], "chvxza:b:d:f:j:i:m:n:p:", longOptions
             )
         else:
-            optlist, args = getopt.getopt(
-                argv[1:],
-                "chvxza:b:d:f:i:",
-                ["help", "no-apis", "no-info", "no-tools", "verbose", "yes"],
-            )
+            optlist, args = getopt.getopt(argv[1:], "chvxza:b:d:f:j:i:", longOptions)
     except getopt.GetoptError as err:
         print(err)
         usage()
@@ -2117,6 +6160,9 @@ def main(argv):
     global platBinDir
 
     depChecks = True
+    uninstall = False
+    archiveFileName = ""
+    releaseArchiveName = ""
 
     for opt, arg in optlist:
         if opt in ["-h", "--help"]:
@@ -2129,6 +6175,12 @@ def main(argv):
             modDir = arg
         elif opt == "-i":
             distDir = os.path.normpath(arg)
+        elif opt == "-j":
+            try:
+                installJobs = int(arg)
+            except ValueError:
+                print("The number of parallel workers must be an integer.")
+                usage()
         elif opt == "-x":
             depChecks = False
         elif opt == "-c":
@@ -2164,107 +6216,242 @@ def main(argv):
             withPyqt6Tools = True
         elif opt == "--no-info":
             createInstallInfoFile = False
+        elif opt == "--incremental":
+            incrementalInstall = True
+        elif opt == "--probe-deps":
+            probeDependencies = True
+        elif opt == "--profile":
+            profileCpu = True
+        elif opt == "--profile-memory":
+            profileMemory = True
+        elif opt == "--profile-phases":
+            profilePhases = [name.strip() for name in arg.split(",") if name.strip()]
+            for name in profilePhases:
+                if name not in installPhaseNames:
+                    print("Unknown phase '{0}'.".format(name))
+                    print("Known phases: {0}".format(", ".join(installPhaseNames)))
+                    usage()
+        elif opt == "--compact":
+            compactInstall = True
+        elif opt == "--zip-bundle":
+            zipBundle = True
+        elif opt == "--module-index":
+            moduleIndex = True
+        elif opt == "--optimize":
+            try:
+                optimizationLevels = sorted(
+                    {int(level) for level in arg.split(",") if level.strip()}
+                )
+            except ValueError:
+                optimizationLevels = []
+            if not optimizationLevels or not set(optimizationLevels) <= {0, 1, 2}:
+                print("Invalid optimization levels '{0}'.".format(arg))
+                usage()
+        elif opt == "--pyc-invalidation":
+            if arg not in ("timestamp", "checked-hash", "unchecked-hash"):
+                print("Unknown byte code invalidation mode '{0}'.".format(arg))
+                usage()
+            pycInvalidation = arg
+        elif opt == "--wheelhouse":
+            if not os.path.isdir(arg):
+                print("The wheelhouse directory '{0}' does not exist.".format(arg))
+                usage()
+            pipWheelhouse = os.path.abspath(arg)
+        elif opt == "--lock":
+            if not os.path.isfile(arg):
+                print("The lock file '{0}' does not exist.".format(arg))
+                usage()
+            pipLockFile = os.path.abspath(arg)
+        elif opt == "--write-lock":
+            writeLockFileName = os.path.abspath(arg)
+        elif opt == "--uninstall":
+            uninstall = True
+        elif opt == "--staged":
+            stagedInstall = True
+        elif opt == "--trace":
+            traceFileName = os.path.abspath(arg)
+        elif opt == "--archive":
+            if not arg.endswith((".tar.gz", ".tgz", ".tar.zst", ".tzst", ".zip")):
+                print("Unsupported archive type of '{0}'.".format(arg))
+                usage()
+            archiveFileName = os.path.abspath(arg)
+        elif opt == "--from-archive":
+            if not os.path.isfile(arg):
+                print("The release archive '{0}' does not exist.".format(arg))
+                usage()
+            releaseArchiveName = arg
+        elif opt == "--copy-strategy":
+            if arg not in ("auto", "reflink", "hardlink", "copy"):
+                print("Unknown copy strategy '{0}'.".format(arg))
+                usage()
+            copyStrategy = arg
         elif opt in ["-v", "--verbose"]:
             verbose = True
 
-    infoName = ""
-    installFromSource = not os.path.isdir(sourceDir)
+    if stagedInstall and incrementalInstall:
+        print("The options --staged and --incremental cannot be combined.")
+        usage()
+    if archiveFileName and (
+        distDir or stagedInstall or incrementalInstall or uninstall
+    ):
+        print(
+            "The option --archive cannot be combined with -i, --incremental,"
+            " --staged or --uninstall."
+        )
+        usage()
+
+    if compactInstall and not doCompile:
+        print("The option --compact cannot be combined with -z.")
+        usage()
 
-    # check dependencies
-    if depChecks:
-        doDependancyChecks()
+    if moduleIndex and zipBundle:
+        # the modules of a bundle are looked up by zipimport already
+        print("The option --module-index cannot be combined with --zip-bundle.")
+        usage()
+
+    if not pycInvalidation:
+        # like py_compile, use hash based byte code files for reproducible
+        # builds
+        pycInvalidation = (
+            "checked-hash" if os.environ.get("SOURCE_DATE_EPOCH") else "timestamp"
+        )
+
+    if profilePhases and not profileMemory:
+        profileCpu = True
+    if not profilePhases:
+        startProfiling("")
 
+    if uninstall:
+        exit(uninstallEric())
+
+    if apisDir is None:
+        apisDir = defaultApisDir()
+
+    if archiveFileName:
+        # the files are installed relative to a prefix, that is never
+        # created, and written to the archive
+        distDir = os.path.join(
+            tempfile.gettempdir(), "eric7-archive-{0}".format(os.getpid())
+        )
+
+    if releaseArchiveName:
+        with installPhase("release archive"):
+            print("Reading release archive ...")
+            sourceDir = readSourceArchive(releaseArchiveName)
+    installFromSource = not sourceArchive and not os.path.isdir(sourceDir)
     if installFromSource:
         sourceDir = os.path.abspath("..")
 
     eric7SourceDir = (
         os.path.join(sourceDir, "src", "eric7")
-        if os.path.exists(os.path.join(sourceDir, "src", "eric7"))
+        if sourceExists(os.path.join(sourceDir, "src", "eric7"))
         else os.path.join(sourceDir, "eric7")
     )
-
-    # cleanup source if installing from source
     if installFromSource:
-        print("Cleaning up source ...")
-        cleanupSource(sourceDir)
-        print()
-
         configName = os.path.join(eric7SourceDir, "eric7config.py")
-        if os.path.exists(os.path.join(sourceDir, ".hg")):
-            # we are installing from source with repo
-            infoName = os.path.join(eric7SourceDir, "UI", "Info.py")
-            prepareInfoFile(infoName)
 
     if len(cfg) == 0:
         createInstallConfig()
 
-    # get rid of development config file, if it exists
-    with contextlib.suppress(OSError):
-        if installFromSource:
-            os.rename(configName, configName + ".orig")
-            configNameC = configName + "c"
-            if os.path.exists(configNameC):
-                os.remove(configNameC)
-        os.remove(configName)
-
-    # cleanup old installation
-    print("Cleaning up old installation ...")
-    try:
-        if doCleanup:
-            if distDir:
-                shutil.rmtree(distDir, True)
-            else:
-                cleanUp()
-    except OSError as msg:
-        sys.stderr.write("Error: {0}\nTry install as root.\n".format(msg))
-        exit(7)
-
-    # Create a config file and delete the default one
-    print("\nCreating configuration file ...")
-    createConfig()
-
-    createInstallInfo()
-
-    # Compile .ui files
-    print("\nCompiling user interface files ...")
-    # step 1: remove old Ui_*.py files
-    for root, _, files in os.walk(sourceDir):
-        for file in [f for f in files if fnmatch.fnmatch(f, "Ui_*.py")]:
-            os.remove(os.path.join(root, file))
-    # step 2: compile the forms
-    compileUiFiles()
-
-    if doCompile:
-        print("\nCompiling source files ...")
-        skipRe = re.compile(r"DebugClients[\\/]Python[\\/]")
-        sys.stdout = io.StringIO()
-        if distDir:
-            compileall.compile_dir(
-                eric7SourceDir,
-                ddir=os.path.join(distDir, modDir, cfg["ericDir"]),
-                rx=skipRe,
-                quiet=True,
-            )
-            py_compile.compile(
-                configName, dfile=os.path.join(distDir, modDir, "eric7config.py")
+    if stagedInstall:
+        # a staged installation can only replace the directories within the
+        # eric directory as a whole, the files of the others are staged
+        # individually
+        ericDir = os.path.normpath(cfg["ericDir"])
+        outsideKeys = [
+            key
+            for key, value in cfg.items()
+            if key not in ("ericDir", "bindir", "mdir", "apidir", "ericOthersDir")
+            and value
+            and not os.path.normpath(value).startswith(ericDir + os.sep)
+        ]
+        if outsideKeys:
+            print(
+                "The option --staged needs the directories of the entries '{0}'"
+                " to be within '{1}'.".format("', '".join(sorted(outsideKeys)), ericDir)
             )
-        else:
-            compileall.compile_dir(
-                eric7SourceDir,
-                ddir=os.path.join(modDir, cfg["ericDir"]),
-                rx=skipRe,
-                quiet=True,
+            exit(2)
+
+    # The phases are given in an order respecting their dependencies. The
+    # sources and the old installation are only modified after the
+    # dependencies were checked successfully. The configuration file is
+    # replaced only after the cleanup of the old installation, because a
+    # legacy cleanup imports the existing one.
+    phases = []
+    if depChecks:
+        phases.append(("dependency checks", doDependancyChecks, [], ["dependencies"]))
+    if installFromSource and os.path.exists(os.path.join(sourceDir, ".hg")):
+        phases.append(("revision", identifyRevision, [], ["revision"]))
+    if installFromSource:
+        phases.append(
+            ("source cleanup", prepareSource, ["dependencies", "revision"], ["source"])
+        )
+    phases += [
+        ("cleanup", removeOldInstallation, ["dependencies"], ["old installation"]),
+        (
+            "configuration",
+            writeConfiguration,
+            ["dependencies", "old installation", "source"],
+            ["configuration"],
+        ),
+        ("forms", compileForms, ["dependencies", "source"], ["forms"]),
+    ]
+    if not stagedInstall and installArchive is None and not archiveFileName:
+        phases.append(("assets", installAssets, ["old installation"], ["assets"]))
+    if doCompile:
+        phases.append(
+            (
+                "compilation",
+                compileEric,
+                ["source", "configuration", "forms"],
+                ["compiled sources"],
             )
-            py_compile.compile(configName, dfile=os.path.join(modDir, "eric7config.py"))
-        sys.stdout = sys.__stdout__
-    print("\nInstalling eric ...")
-    res = installEric()
+        )
+    runPhases(phases)
 
-    if createInstallInfoFile:
-        with open(
-            os.path.join(cfg["ericDir"], installInfoName), "w"
-        ) as installInfoFile:
-            json.dump(installInfo, installInfoFile, indent=2)
+    print("\nInstalling eric ...")
+    try:
+        if archiveFileName:
+            openArchive(archiveFileName)
+        with installPhase("installation"):
+            res = installEric()
+
+        if createInstallInfoFile:
+            installInfo["phases"] = installPhases
+            installInfoFileName = stagedPath(
+                os.path.join(cfg["ericDir"], installInfoName)
+            )
+            if installArchive is not None:
+                writeArchiveEntry(
+                    installInfoFileName,
+                    json.dumps(installInfo, indent=2).encode("utf-8"),
+                    0o644,
+                )
+            else:
+                with open(installInfoFileName, "w") as installInfoFile:
+                    json.dump(installInfo, installInfoFile, indent=2)
+                recordInstalledFile(installInfoFileName)
+        with installPhase("finishing"):
+            if res == 0:
+                writeInstallManifest(
+                    stagedPath(os.path.join(cfg["ericDir"], installManifestName))
+                )
+                if stagingDir:
+                    res = swapStagedInstall()
+            if res == 0 and obsoleteManifest:
+                removeObsoleteFiles(obsoleteManifest, obsoleteDirectories)
+            discardStaging()
+            if installArchive is not None:
+                if res == 0:
+                    closeArchive()
+                    print("\nWrote the installation to '{0}'.".format(archiveFileName))
+                else:
+                    discardArchive(archiveFileName)
+    except BaseException:
+        # don't leave an incomplete installation or archive behind
+        discardStaging()
+        discardArchive(archiveFileName)
+        raise
 
     # do some cleanup
     with contextlib.suppress(OSError):
@@ -2282,6 +6469,12 @@ def main(argv):
                 os.remove(infoNameC)
             os.rename(infoName + ".orig", infoName)
 
+    waitForTombstones()
+
+    printPhaseSummary()
+    if traceFileName:
+        writeTrace(traceFileName)
+
     print("\nInstallation complete.")
     print()
 